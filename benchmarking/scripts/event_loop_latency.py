@@ -0,0 +1,119 @@
+"""Measures how late the event loop runs while texts are censored in it, or offloaded"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from better_profanity import Profanity, ProfanityBatcher
+
+from paragraphs import load_dataset
+
+# Seconds between the ticks of the event loop whose lateness is measured
+TICK_INTERVAL = 0.001
+
+# Number of ticks measured per trial, for the p99 to be their 10th latest
+MIN_SAMPLES = 1000
+
+# Seconds a tick may run late at p99 while texts are censored in processes,
+# even with a single CPU for the event loop and the workers
+LATENCY_BUDGET = 0.005
+
+profanity = Profanity()
+
+
+def get_percentiles(timings, percentiles=(50, 95, 99)):
+    timings = sorted(timings)
+    return {
+        percentile: timings[min(len(timings) - 1, len(timings) * percentile // 100)]
+        for percentile in percentiles
+    }
+
+
+async def measure_latency(censor_texts):
+    """
+    Return the percentiles of how late a tick of the event loop runs, while
+    `censor_texts` runs in it, as many times as it takes to measure
+    `MIN_SAMPLES` ticks. It is run once before, to warm up the executors.
+    """
+    await censor_texts()
+    latencies = []
+    done = False
+
+    async def tick():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            latencies.append(time.perf_counter() - start - TICK_INTERVAL)
+
+    ticker = asyncio.ensure_future(tick())
+    await asyncio.sleep(0)
+    while len(latencies) < MIN_SAMPLES:
+        await censor_texts()
+    done = True
+    await ticker
+    return get_percentiles(latencies)
+
+
+def run_trial(name, censor_texts):
+    # In a new event loop, as `asyncio.run` needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        percentiles = loop.run_until_complete(measure_latency(censor_texts))
+    finally:
+        loop.close()
+    print(
+        "{name}: ".format(name=name)
+        + ", ".join(
+            "p{}={:.2f}ms".format(percentile, latency * 1000)
+            for percentile, latency in percentiles.items()
+        )
+    )
+    return percentiles
+
+
+@pytest.fixture(scope="module")
+def texts():
+    # Texts of 10 paragraphs, about 4,500 characters, like long user bios
+    original, _ = load_dataset("1000paras-005per")
+    paragraphs = original.splitlines()
+    return ["\n".join(paragraphs[index : index + 10]) for index in range(0, 500, 10)]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Started before the trials, so that they do not measure its start
+    with profanity.create_executor(workers=os.cpu_count()) as pool:
+        yield pool
+
+
+def test_latency(texts, pool):
+    async def censor_in_loop():
+        for text in texts:
+            profanity.censor(text)
+            await asyncio.sleep(0)
+
+    async def acensor():
+        await asyncio.gather(*[profanity.acensor(text) for text in texts])
+
+    async def acensor_in_processes():
+        await asyncio.gather(
+            *[profanity.acensor(text, executor=pool) for text in texts]
+        )
+
+    async def batcher():
+        batcher = ProfanityBatcher(profanity)
+        await asyncio.gather(*[batcher.censor(text) for text in texts])
+
+    run_trial("censor in the event loop", censor_in_loop)
+    run_trial("acensor in threads", acensor)
+    offloaded = run_trial("acensor in processes", acensor_in_processes)
+    run_trial("ProfanityBatcher in threads", batcher)
+
+    # Threads still hold the GIL while censoring, but processes do not
+    assert offloaded[99] < LATENCY_BUDGET
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s"])
@@ -1,8 +1,22 @@
-"""Measures how much memory a profanity filter consumes"""
+"""Measures how much memory a profanity filter consumes, and asserts its budgets"""
 
 import argparse
+import random
+import string
+import subprocess
+import sys
+
+import pytest
 from memory_profiler import profile
 
+# Budgets in bytes, above the memory taken on CPython 3.11
+DEFAULT_WORDLIST_BUDGET = 1 * 1024 * 1024
+LARGE_WORDLIST_BUDGET = 24 * 1024 * 1024
+VARYING_STRING_BUDGET = 256
+
+# Number of words of the synthetic wordlist, like the custom lists of a tenant
+LARGE_WORDLIST_SIZE = 50000
+
 
 @profile
 def profile_default_wordlist():
@@ -16,6 +30,75 @@ def profile_custom_wordlist(wordlist_path):
     Profanity(wordlist_path)
 
 
+def measure(statement, setup="pass"):
+    """
+    Return the memory allocated by `statement` and still held after it, in
+    bytes, in a new interpreter where `setup` is run first.
+    """
+    code = (
+        "import tracemalloc\n"
+        "{setup}\n"
+        "tracemalloc.start()\n"
+        "{statement}\n"
+        "print(tracemalloc.get_traced_memory()[0])\n"
+    ).format(setup=setup, statement=statement)
+    return int(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def write_large_wordlist(filename, size=LARGE_WORDLIST_SIZE):
+    # Random words of letters and digits, which share few keys and prefixes
+    generator = random.Random(0)
+    with open(filename, "w") as wordlist_file:
+        for _ in range(size):
+            length = generator.randint(4, 12)
+            word = "".join(
+                generator.choice(string.ascii_lowercase + string.digits)
+                for _ in range(length)
+            )
+            wordlist_file.write(word + "\n")
+
+
+@pytest.fixture(scope="module")
+def large_wordlist(tmp_path_factory):
+    filename = str(tmp_path_factory.mktemp("wordlists") / "large_wordlist.txt")
+    write_large_wordlist(filename)
+    return filename
+
+
+def test_default_wordlist_memory():
+    size = measure(
+        "profanity = Profanity(); profanity.censor('sh1t')",
+        setup="from better_profanity import Profanity",
+    )
+    print("default wordlist: {:.2f}MB".format(size / 1024 / 1024))
+    assert size < DEFAULT_WORDLIST_BUDGET
+
+
+def test_large_wordlist_memory(large_wordlist):
+    size = measure(
+        "profanity = Profanity({!r}); profanity.censor('sh1t')".format(large_wordlist),
+        setup="from better_profanity import Profanity",
+    )
+    print("{} words: {:.2f}MB".format(LARGE_WORDLIST_SIZE, size / 1024 / 1024))
+    assert size < LARGE_WORDLIST_BUDGET
+
+
+def test_varying_string_memory(large_wordlist):
+    # The `VaryingString`s of the words of a bucket are created once the
+    # bucket is looked up, so a wordlist may end up with all of them
+    size = measure(
+        "varying_strings = [VaryingString(word, char_map=char_map) for word in words]",
+        setup=(
+            "from better_profanity import Profanity\n"
+            "from better_profanity.varying_string import VaryingString\n"
+            "char_map = Profanity([]).CHARS_MAPPING\n"
+            "words = open({!r}).read().split()"
+        ).format(large_wordlist),
+    )
+    print("VaryingString: {:.0f} bytes each".format(size / LARGE_WORDLIST_SIZE))
+    assert size / LARGE_WORDLIST_SIZE < VARYING_STRING_BUDGET
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Profiles the memory usage of a better_profanity profanity filter"
@@ -27,9 +110,17 @@ if __name__ == "__main__":
         default=None,
         help="word list containing profanity",
     )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="assert the memory budgets, with a large synthetic word list",
+    )
     args = parser.parse_args()
     wordlist_path = args.wordlist
 
+    if args.check:
+        sys.exit(pytest.main([__file__, "-s"]))
+
     # Profile the memory consumed by a filter using the default word list.
     profile_default_wordlist()
 
@@ -0,0 +1,71 @@
+"""Measures how long importing better_profanity takes, and asserts its budgets"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Budgets in seconds, generous enough for slow CI machines
+IMPORT_BUDGET = 0.010
+FIRST_USE_BUDGET = 0.100
+
+ROUNDS = 10
+
+
+def measure(statement, setup="pass"):
+    """
+    Return the shortest time to run `statement` after `setup`, in a new
+    interpreter for each round.
+    """
+    code = (
+        "import time\n"
+        "{setup}\n"
+        "start = time.perf_counter()\n"
+        "{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    ).format(setup=setup, statement=statement)
+
+    # Allow the bytecode to be cached by the first round, as it is once installed
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    timings = []
+    for _ in range(ROUNDS + 1):
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        timings.append(float(output))
+    return min(timings[1:])
+
+
+def test_import_time():
+    timing = measure("import better_profanity")
+    print("import better_profanity: {:.2f}ms".format(timing * 1000))
+    assert timing < IMPORT_BUDGET
+
+
+def test_import_class_time():
+    timing = measure("from better_profanity import Profanity")
+    print("from better_profanity import Profanity: {:.2f}ms".format(timing * 1000))
+    assert timing < IMPORT_BUDGET
+
+
+def test_import_is_lazy():
+    # Neither the default profanity filter nor the unicode characters are loaded
+    code = (
+        "import better_profanity, better_profanity.constants as constants\n"
+        "assert 'profanity' not in vars(better_profanity)\n"
+        "assert 'ALLOWED_CHARACTERS' not in vars(constants)\n"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_first_use_time():
+    timing = measure(
+        "from better_profanity import profanity; profanity.censor('sh1t')",
+        setup="import better_profanity",
+    )
+    print("first use of the default profanity: {:.2f}ms".format(timing * 1000))
+    assert timing < FIRST_USE_BUDGET
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s"])
@@ -5,8 +5,10 @@ import pytest
 
 from better_profanity import profanity
 
+MEGABYTE = 1024 * 1024
 
-def trial(benchmark, dataset):
+
+def load_dataset(dataset):
     # Load original text and its censored counterpart.
     root = os.path.join(os.path.dirname(__file__), "../data/paragraphs/")
     root = os.path.abspath(root)
@@ -19,12 +21,29 @@ def trial(benchmark, dataset):
         original = f.read()
     with open(censored_path) as f:
         expected_censored = f.read()
+    return original, expected_censored
+
+
+def trial(benchmark, dataset):
+    original, expected_censored = load_dataset(dataset)
 
     # Benchmark the censor operation.
     actual_censored = benchmark(profanity.censor, original)
     assert actual_censored == expected_censored
 
 
+def large_trial(benchmark, size):
+    # Repeat the largest dataset until the text is at least `size` bytes.
+    original, expected_censored = load_dataset("1000paras-005per")
+    repeat = -(-size // len(original.encode("utf-8")))
+    original *= repeat
+    expected_censored *= repeat
+
+    # Benchmark a single censor operation, as the text is too large to repeat it.
+    actual_censored = benchmark.pedantic(profanity.censor, args=(original,), rounds=1)
+    assert actual_censored == expected_censored
+
+
 def test_1para_0per(benchmark):
     # 1 paragraph, 0% profanity
     trial(benchmark, "0001paras-000per")
@@ -70,5 +89,20 @@ def test_100para_5per(benchmark):
     trial(benchmark, "0100paras-005per")
 
 
+def test_1000para_5per(benchmark):
+    # 1000 paragraphs, 5% profanity
+    trial(benchmark, "1000paras-005per")
+
+
+def test_1mb_5per(benchmark):
+    # 1 MB of paragraphs, 5% profanity
+    large_trial(benchmark, MEGABYTE)
+
+
+def test_10mb_5per(benchmark):
+    # 10 MB of paragraphs, 5% profanity
+    large_trial(benchmark, 10 * MEGABYTE)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
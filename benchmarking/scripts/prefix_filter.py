@@ -0,0 +1,67 @@
+"""Measures how many clean tokens the prefixes of the words reject, and how fast"""
+
+import argparse
+import time
+
+from better_profanity import Profanity
+
+from paragraphs import load_dataset
+
+DATASETS = ["0001paras-000per", "0100paras-005per", "1000paras-005per"]
+
+
+def measure(dataset, prefix_length):
+    original, _ = load_dataset(dataset)
+    profanity = Profanity(prefix_length=prefix_length)
+    wordset = profanity.CENSOR_WORDSET
+    tokens = {
+        word.lower()
+        for word, _, _, _ in profanity.ALLOWED_CHARACTERS.tokenize(original)
+    }
+
+    # Clean tokens are neither words to censor nor the start of one
+    clean_tokens = [
+        token
+        for token in tokens
+        if wordset.get(token) is None and not wordset.may_start_longer_word(token)
+    ]
+    passed_tokens = [token for token in clean_tokens if wordset.may_match(token)]
+
+    start = time.perf_counter()
+    for token in tokens:
+        wordset.may_match(token)
+    elapsed = time.perf_counter() - start
+
+    info = wordset.prefix_info()
+    print(
+        "{dataset} prefix_length={length}: {clean} clean of {tokens} tokens, "
+        "false positive rate {rate:.1%}, {time:.2f}us per token, "
+        "{prefixes} prefixes in {size} bytes".format(
+            dataset=dataset,
+            length=prefix_length,
+            clean=len(clean_tokens),
+            tokens=len(tokens),
+            rate=len(passed_tokens) / len(clean_tokens) if clean_tokens else 0.0,
+            time=elapsed / len(tokens) * 1e6 if tokens else 0.0,
+            prefixes=info["prefixes"],
+            size=info["prefix_bytes"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the false positive rate of the prefixes of the words"
+    )
+    parser.add_argument(
+        "--prefix-length",
+        nargs="+",
+        type=int,
+        default=[2, 3, 4, 5],
+        help="numbers of first characters of the words to keep",
+    )
+    args = parser.parse_args()
+
+    for dataset in DATASETS:
+        for prefix_length in args.prefix_length:
+            measure(dataset, prefix_length)
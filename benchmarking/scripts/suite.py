@@ -0,0 +1,248 @@
+"""Measures the speed of better_profanity over sweeps of inputs and word lists,
+saves the results as a JSON baseline, and compares them against one"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import better_profanity
+from better_profanity import Profanity, speedups
+from better_profanity.utils import get_complete_path_of_file, read_wordlist
+
+from filter_memory import write_large_wordlist
+from import_time import measure as measure_in_interpreter
+from paragraphs import load_dataset
+
+# Sweeps of the number of characters of the texts, of the percentage of swear
+# words in them, and of the number of words to censor
+INPUT_SIZES = [1000, 10000, 100000, 1000000]
+DENSITIES = [0, 5, 50, 100]
+WORDLIST_SIZES = [835, 10000, 100000]
+
+# Number of characters of the texts of the other sweeps
+TEXT_SIZE = 100000
+
+ROUNDS = 5
+
+# A case is slower than its baseline beyond this fraction of its time
+THRESHOLD = 0.20
+
+LEETSPEAK_TABLE = str.maketrans("aeilost", "@31!05+")
+UNICODE_TABLE = str.maketrans("aeiouAEIOU", "àéîõüÀÉÎÕÜ")
+
+
+def best_time(function, *args, rounds=ROUNDS):
+    """
+    Return the shortest time to call `function` with `args`, in seconds, once
+    it was called a first time to fill the memo of the verdicts of tokens.
+    """
+    function(*args)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def repeat_to_size(text, size):
+    return (text * -(-size // len(text)))[:size]
+
+
+def leetspeak(text):
+    # Every letter which has a common substitute is replaced by it
+    return text.translate(LEETSPEAK_TABLE)
+
+
+def unicode_heavy(text):
+    # Accented vowels, and a word of CJK characters and an emoji every sentence
+    return text.translate(UNICODE_TABLE).replace(". ", ". 日本語 😀 ")
+
+
+def get_texts():
+    """Return the texts of the cases, by the name of their sweep."""
+    large_text, _ = load_dataset("1000paras-005per")
+    texts = {}
+    for size in INPUT_SIZES:
+        texts["size/{}".format(size)] = repeat_to_size(large_text, size)
+    for density in DENSITIES:
+        text, _ = load_dataset("0010paras-{:03d}per".format(density))
+        texts["density/{}".format(density)] = repeat_to_size(text, TEXT_SIZE)
+    text, _ = load_dataset("0010paras-050per")
+    texts["leetspeak"] = repeat_to_size(leetspeak(text), TEXT_SIZE)
+    texts["unicode"] = repeat_to_size(unicode_heavy(text), TEXT_SIZE)
+    return texts
+
+
+def write_wordlist(filename, size):
+    # The default words, which the texts have, and random ones up to `size`
+    default_words = list(
+        read_wordlist(get_complete_path_of_file("profanity_wordlist.txt"))
+    )
+    write_large_wordlist(filename, max(size - len(default_words), 0))
+    with open(filename, "a") as wordlist_file:
+        wordlist_file.write("\n".join(default_words) + "\n")
+
+
+def throughput(seconds, characters):
+    return {"seconds": seconds, "chars_per_second": characters / seconds}
+
+
+def run(only=None, rounds=ROUNDS):
+    """
+    Return the results of the cases by name, only of those whose names contain
+    one of the patterns of `only` if given.
+    """
+    results = {}
+
+    def selected(name):
+        return only is None or any(pattern in name for pattern in only)
+
+    def report(name, result):
+        results[name] = result
+        line = "{name:<32} {seconds:>10.3f}ms".format(
+            name=name, seconds=result["seconds"] * 1000
+        )
+        if "chars_per_second" in result:
+            line += " {:>10.2f} MB/s".format(result["chars_per_second"] / 1e6)
+        print(line, flush=True)
+
+    if selected("import"):
+        report("import", {"seconds": measure_in_interpreter("import better_profanity")})
+        report(
+            "import/first_use",
+            {
+                "seconds": measure_in_interpreter(
+                    "from better_profanity import profanity; profanity.censor('sh1t')",
+                    setup="import better_profanity",
+                )
+            },
+        )
+
+    texts = get_texts()
+    for name, text in texts.items():
+        for operation in ("censor", "contains"):
+            case = "{}/{}".format(operation, name)
+            if not selected(case):
+                continue
+            # A new filter for each case, which the previous cases did not warm
+            profanity = Profanity()
+            function = (
+                profanity.censor
+                if operation == "censor"
+                else profanity.contains_profanity
+            )
+            report(
+                case, throughput(best_time(function, text, rounds=rounds), len(text))
+            )
+
+    text = texts["density/5"]
+    with tempfile.TemporaryDirectory() as directory:
+        for size in WORDLIST_SIZES:
+            load_case = "load/wordlist/{}".format(size)
+            censor_case = "censor/wordlist/{}".format(size)
+            if not (selected(load_case) or selected(censor_case)):
+                continue
+            filename = os.path.join(directory, "wordlist_{}.txt".format(size))
+            write_wordlist(filename, size)
+            if selected(load_case):
+                report(
+                    load_case,
+                    {"seconds": best_time(Profanity, filename, rounds=rounds)},
+                )
+            if selected(censor_case):
+                seconds = best_time(Profanity(filename).censor, text, rounds=rounds)
+                report(censor_case, throughput(seconds, len(text)))
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Print how the time of each case changed from the baseline, and return the
+    names of the cases which are slower by more than `threshold`.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print("{name:<32} {status}".format(name=name, status="new"))
+            continue
+        change = result["seconds"] / baseline[name]["seconds"] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            "{name:<32} {change:>+8.1%} {speedup:>8.2f}x {status}".format(
+                name=name,
+                change=change,
+                speedup=baseline[name]["seconds"] / result["seconds"],
+                status="REGRESSED" if regressed else "ok",
+            )
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks better_profanity, and compares it against a baseline"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="PATTERN",
+        help="only run the cases whose names contain one of the patterns",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=ROUNDS,
+        help="number of times each case is run, keeping the fastest "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save", metavar="FILE", help="save the results as a JSON baseline"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="compare the results against a JSON baseline, and exit with status 1 "
+        "if a case regressed",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="fraction of its baseline time a case may be slower by "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    print(
+        "Scanner: {}".format("C" if speedups.extension is not None else "pure Python")
+    )
+    results = run(args.only, args.rounds)
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(
+                {
+                    "version": better_profanity.__version__,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "speedups": speedups.extension is not None,
+                    "results": results,
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print("\nCompared to {}:".format(args.compare))
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("{} cases regressed.".format(len(regressions)))
+            sys.exit(1)
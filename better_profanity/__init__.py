@@ -1,10 +1,46 @@
 # -*- coding: utf-8 -*-
 
-from .better_profanity import Profanity
+import sys
+from _thread import allocate_lock
+
+from .better_profanity import Profanity, ProfanityMatch
+from .character_class import CharacterClass
 
 __all__ = ["name", "__version__", "profanity"]
 
 name = "better_profanity"
 __version__ = "0.7.0"
 
-profanity = Profanity()
+if sys.version_info >= (3, 7):
+    _lock = allocate_lock()
+
+    def __getattr__(name):
+        # The modules which only some uses need are imported on first use
+        if name == "ProfanityBatcher":
+            from .aio import ProfanityBatcher
+
+            return ProfanityBatcher
+        if name == "ProfanityRegistry":
+            from .registry import ProfanityRegistry
+
+            return ProfanityRegistry
+
+        # `profanity` is only created on first use
+        if name != "profanity":
+            raise AttributeError(
+                "module {module!r} has no attribute {name!r}".format(
+                    module=__name__, name=name
+                )
+            )
+        global profanity
+        with _lock:
+            if "profanity" not in globals():
+                profanity = Profanity()
+        return profanity
+
+
+else:
+    from .aio import ProfanityBatcher
+    from .registry import ProfanityRegistry
+
+    profanity = Profanity()
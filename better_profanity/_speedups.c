@@ -0,0 +1,748 @@
+/*
+ * The scanner of better_profanity in C: it splits texts into words, and
+ * matches them, and the words joined with their next ones, against the
+ * verdicts remembered by a `TokenVerdicts`. The strings which are not
+ * remembered yet are still looked up by its Python methods, so that both
+ * scanners find the same swear words.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Code points below this are looked up in the bitmap of a character class */
+#define BITMAP_SIZE 0x10000
+
+typedef struct {
+    Py_buffer bitmap;
+    Py_buffer starts;
+    Py_buffer ends;
+    Py_ssize_t number_of_ranges;
+} CharacterClass;
+
+static int
+character_class_init(CharacterClass *character_class)
+{
+    if (character_class->bitmap.len < BITMAP_SIZE / 8) {
+        PyErr_SetString(PyExc_ValueError, "bitmap is too short");
+        return -1;
+    }
+    if (character_class->starts.itemsize != sizeof(long) ||
+        character_class->ends.itemsize != sizeof(long) ||
+        character_class->starts.len != character_class->ends.len) {
+        PyErr_SetString(PyExc_ValueError,
+                        "starts and ends must be arrays of the same length");
+        return -1;
+    }
+    character_class->number_of_ranges =
+        character_class->starts.len / (Py_ssize_t)sizeof(long);
+    return 0;
+}
+
+static void
+character_class_release(CharacterClass *character_class)
+{
+    PyBuffer_Release(&character_class->bitmap);
+    PyBuffer_Release(&character_class->starts);
+    PyBuffer_Release(&character_class->ends);
+}
+
+static inline int
+is_allowed(const CharacterClass *character_class, Py_UCS4 code_point)
+{
+    const long *starts, *ends;
+    Py_ssize_t low, high, middle;
+
+    if (code_point < BITMAP_SIZE) {
+        const unsigned char *bitmap = character_class->bitmap.buf;
+        return (bitmap[code_point >> 3] >> (code_point & 7)) & 1;
+    }
+
+    /* The last range starting at or before the code point */
+    starts = character_class->starts.buf;
+    ends = character_class->ends.buf;
+    low = 0;
+    high = character_class->number_of_ranges;
+    while (low < high) {
+        middle = low + (high - low) / 2;
+        if (starts[middle] <= (long)code_point) {
+            low = middle + 1;
+        }
+        else {
+            high = middle;
+        }
+    }
+    return low > 0 && (long)code_point <= ends[low - 1];
+}
+
+/*
+ * Store the start and end indices of the runs of allowed characters of
+ * text[start:end] in a new array of `bounds`, and return their number, or -1
+ * if it cannot be allocated. It does not need the GIL.
+ */
+static Py_ssize_t
+find_words(int kind, const void *data, Py_ssize_t start, Py_ssize_t end,
+           const CharacterClass *character_class, Py_ssize_t **bounds)
+{
+    Py_ssize_t capacity = 64, count = 0, index = start, word_start;
+    Py_ssize_t *words = PyMem_RawMalloc(2 * capacity * sizeof(Py_ssize_t));
+    Py_ssize_t *resized;
+
+    if (words == NULL) {
+        return -1;
+    }
+    while (index < end) {
+        while (index < end &&
+               !is_allowed(character_class, PyUnicode_READ(kind, data, index))) {
+            index++;
+        }
+        if (index >= end) {
+            break;
+        }
+        word_start = index;
+        while (index < end &&
+               is_allowed(character_class, PyUnicode_READ(kind, data, index))) {
+            index++;
+        }
+        if (count == capacity) {
+            capacity *= 2;
+            resized = PyMem_RawRealloc(words, 2 * capacity * sizeof(Py_ssize_t));
+            if (resized == NULL) {
+                PyMem_RawFree(words);
+                return -1;
+            }
+            words = resized;
+        }
+        words[2 * count] = word_start;
+        words[2 * count + 1] = index;
+        count++;
+    }
+    *bounds = words;
+    return count;
+}
+
+static Py_ssize_t
+split_text(PyObject *text, Py_ssize_t *start, Py_ssize_t *end,
+           const CharacterClass *character_class, Py_ssize_t **bounds)
+{
+    Py_ssize_t length, count;
+    int kind;
+    const void *data;
+
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(text) < 0) {
+        return -1;
+    }
+#endif
+    length = PyUnicode_GET_LENGTH(text);
+    /* Out of range indices are clamped, as `re` does */
+    if (*end > length) {
+        *end = length;
+    }
+    if (*end < 0) {
+        *end = 0;
+    }
+    if (*start < 0) {
+        *start = 0;
+    }
+    if (*start > *end) {
+        *start = *end;
+    }
+
+    kind = PyUnicode_KIND(text);
+    data = PyUnicode_DATA(text);
+    /* The text cannot change, so other threads may run meanwhile */
+    Py_BEGIN_ALLOW_THREADS
+    count = find_words(kind, data, *start, *end, character_class, bounds);
+    Py_END_ALLOW_THREADS
+    if (count < 0) {
+        PyErr_NoMemory();
+    }
+    return count;
+}
+
+/* Return the `(word, start, end, separator)` token of the index-th word */
+static PyObject *
+make_token(PyObject *text, const Py_ssize_t *bounds, Py_ssize_t index,
+           Py_ssize_t end_of_previous_word)
+{
+    PyObject *word, *separator, *token;
+
+    word = PyUnicode_Substring(text, bounds[2 * index], bounds[2 * index + 1]);
+    if (word == NULL) {
+        return NULL;
+    }
+    separator = PyUnicode_Substring(text, end_of_previous_word, bounds[2 * index]);
+    if (separator == NULL) {
+        Py_DECREF(word);
+        return NULL;
+    }
+    token = Py_BuildValue("(NnnN)", word, bounds[2 * index],
+                          bounds[2 * index + 1], separator);
+    return token;
+}
+
+PyDoc_STRVAR(tokenize_doc,
+"tokenize(text, pos, endpos, bitmap, starts, ends)\n"
+"--\n\n"
+"Split text[pos:endpos] into `(word, start, end, separator)` tokens, as\n"
+"`CharacterClass.tokenize` does, for the character class of the bitmap and\n"
+"ranges of code points.");
+
+static PyObject *
+tokenize(PyObject *module, PyObject *args)
+{
+    PyObject *text, *tokens = NULL, *token;
+    Py_ssize_t start, end, count, index, *bounds = NULL;
+    CharacterClass character_class;
+
+    if (!PyArg_ParseTuple(args, "Unny*y*y*:tokenize", &text, &start, &end,
+                          &character_class.bitmap, &character_class.starts,
+                          &character_class.ends)) {
+        return NULL;
+    }
+    if (character_class_init(&character_class) < 0) {
+        goto finally;
+    }
+    count = split_text(text, &start, &end, &character_class, &bounds);
+    if (count < 0) {
+        goto finally;
+    }
+
+    tokens = PyList_New(count);
+    if (tokens == NULL) {
+        goto finally;
+    }
+    for (index = 0; index < count; index++) {
+        token = make_token(text, bounds, index,
+                           index > 0 ? bounds[2 * index - 1] : start);
+        if (token == NULL) {
+            Py_CLEAR(tokens);
+            goto finally;
+        }
+        PyList_SET_ITEM(tokens, index, token);
+    }
+
+finally:
+    PyMem_RawFree(bounds);
+    character_class_release(&character_class);
+    return tokens;
+}
+
+/* The swear words found in a text */
+typedef struct {
+    Py_ssize_t start;
+    Py_ssize_t end;
+    PyObject *word;
+} Match;
+
+typedef struct {
+    Match *items;
+    Py_ssize_t count;
+    Py_ssize_t capacity;
+} Matches;
+
+static int
+append_match(Matches *matches, Py_ssize_t start, Py_ssize_t end, PyObject *word)
+{
+    Match *resized;
+
+    if (matches->count == matches->capacity) {
+        matches->capacity = matches->capacity ? 2 * matches->capacity : 16;
+        resized = PyMem_Realloc(matches->items, matches->capacity * sizeof(Match));
+        if (resized == NULL) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        matches->items = resized;
+    }
+    Py_INCREF(word);
+    matches->items[matches->count].start = start;
+    matches->items[matches->count].end = end;
+    matches->items[matches->count].word = word;
+    matches->count++;
+    return 0;
+}
+
+static void
+matches_release(Matches *matches)
+{
+    Py_ssize_t index;
+
+    for (index = 0; index < matches->count; index++) {
+        Py_DECREF(matches->items[index].word);
+    }
+    PyMem_Free(matches->items);
+}
+
+/*
+ * Return the `(swear_word, may_start_longer_word)` verdict of the string, from
+ * the dict of verdicts or else by calling `lookup(string)`, and count the hits.
+ */
+static PyObject *
+get_verdict(PyObject *verdicts, PyObject *lookup, PyObject *string,
+            Py_ssize_t *hits)
+{
+    PyObject *verdict = PyDict_GetItemWithError(verdicts, string);
+
+    if (verdict != NULL) {
+        Py_INCREF(verdict);
+        (*hits)++;
+    }
+    else if (PyErr_Occurred()) {
+        return NULL;
+    }
+    else {
+        verdict = PyObject_CallFunctionObjArgs(lookup, string, NULL);
+        if (verdict == NULL) {
+            return NULL;
+        }
+    }
+    if (!PyTuple_Check(verdict) || PyTuple_GET_SIZE(verdict) != 2) {
+        PyErr_SetString(PyExc_TypeError, "verdicts must be pairs");
+        Py_DECREF(verdict);
+        return NULL;
+    }
+    return verdict;
+}
+
+/*
+ * The words of a text, lowercased as `str.lower` does. The slice of an ASCII
+ * text is lowercased as a whole the first time it is needed, and the others
+ * word by word, as lowercasing them may depend on the next characters.
+ */
+typedef struct {
+    PyObject *text;
+    Py_ssize_t start;
+    Py_ssize_t end;
+    PyObject *lowered_slice;
+} LoweredText;
+
+static PyObject *
+lowercase_substring(LoweredText *lowered_text, Py_ssize_t start, Py_ssize_t end)
+{
+    PyObject *substring, *lowered;
+
+    if (PyUnicode_IS_ASCII(lowered_text->text)) {
+        if (lowered_text->lowered_slice == NULL) {
+            substring = PyUnicode_Substring(lowered_text->text, lowered_text->start,
+                                            lowered_text->end);
+            if (substring == NULL) {
+                return NULL;
+            }
+            lowered_text->lowered_slice = PyObject_CallMethod(substring, "lower",
+                                                              NULL);
+            Py_DECREF(substring);
+            if (lowered_text->lowered_slice == NULL) {
+                return NULL;
+            }
+        }
+        return PyUnicode_Substring(lowered_text->lowered_slice,
+                                   start - lowered_text->start,
+                                   end - lowered_text->start);
+    }
+
+    substring = PyUnicode_Substring(lowered_text->text, start, end);
+    if (substring == NULL) {
+        return NULL;
+    }
+    lowered = PyObject_CallMethod(substring, "lower", NULL);
+    Py_DECREF(substring);
+    return lowered;
+}
+
+/*
+ * Append the lowercase separator before the word if `with_separator` is true,
+ * and the lowercase word, to the string `*joined`.
+ */
+static int
+join_word(PyObject **joined, LoweredText *lowered_text, const Py_ssize_t *bounds,
+          Py_ssize_t index, int with_separator)
+{
+    PyObject *lowered;
+
+    if (with_separator) {
+        lowered = lowercase_substring(lowered_text, bounds[2 * index - 1],
+                                      bounds[2 * index]);
+        if (lowered == NULL) {
+            return -1;
+        }
+        PyUnicode_Append(joined, lowered);
+        Py_DECREF(lowered);
+        if (*joined == NULL) {
+            return -1;
+        }
+    }
+    lowered = lowercase_substring(lowered_text, bounds[2 * index],
+                                  bounds[2 * index + 1]);
+    if (lowered == NULL) {
+        return -1;
+    }
+    PyUnicode_Append(joined, lowered);
+    Py_DECREF(lowered);
+    return *joined == NULL ? -1 : 0;
+}
+
+/*
+ * Check whether the word combined with its next words forms a swear word, as
+ * `any_next_words_form_swear_word` does, looking up the combined words in the
+ * dict of verdicts of joined words. Store the swear word, or `None`, in
+ * `swear_word`, and the end index of its last word in `end_index`.
+ */
+static int
+look_ahead(LoweredText *lowered_text, const Py_ssize_t *bounds, Py_ssize_t index,
+           Py_ssize_t end_of_next_words, PyObject *joined_verdicts,
+           PyObject *lookup_joined, PyObject **swear_word,
+           Py_ssize_t *end_index)
+{
+    PyObject *full_word, *full_word_with_separators = NULL, *verdict;
+    Py_ssize_t next_index, unused_hits = 0;
+    int may_extend_word = 1, may_extend_word_with_separators = 1;
+
+    *swear_word = NULL;
+    full_word = lowercase_substring(lowered_text, bounds[2 * index],
+                                    bounds[2 * index + 1]);
+    if (full_word == NULL) {
+        return -1;
+    }
+    Py_INCREF(full_word);
+    full_word_with_separators = full_word;
+
+    for (next_index = index + 1; next_index < end_of_next_words; next_index++) {
+        if (may_extend_word) {
+            if (join_word(&full_word, lowered_text, bounds, next_index, 0) < 0) {
+                goto error;
+            }
+            verdict = get_verdict(joined_verdicts, lookup_joined, full_word,
+                                  &unused_hits);
+            if (verdict == NULL) {
+                goto error;
+            }
+            if (PyTuple_GET_ITEM(verdict, 0) != Py_None) {
+                *swear_word = PyTuple_GET_ITEM(verdict, 0);
+                Py_INCREF(*swear_word);
+                Py_DECREF(verdict);
+                *end_index = bounds[2 * next_index + 1];
+                goto done;
+            }
+            may_extend_word = PyObject_IsTrue(PyTuple_GET_ITEM(verdict, 1));
+            Py_DECREF(verdict);
+            if (may_extend_word < 0) {
+                goto error;
+            }
+        }
+        if (may_extend_word_with_separators) {
+            if (join_word(&full_word_with_separators, lowered_text, bounds,
+                          next_index, 1) < 0) {
+                goto error;
+            }
+            verdict = get_verdict(joined_verdicts, lookup_joined,
+                                  full_word_with_separators, &unused_hits);
+            if (verdict == NULL) {
+                goto error;
+            }
+            if (PyTuple_GET_ITEM(verdict, 0) != Py_None) {
+                *swear_word = PyTuple_GET_ITEM(verdict, 0);
+                Py_INCREF(*swear_word);
+                Py_DECREF(verdict);
+                *end_index = bounds[2 * next_index + 1];
+                goto done;
+            }
+            may_extend_word_with_separators =
+                PyObject_IsTrue(PyTuple_GET_ITEM(verdict, 1));
+            Py_DECREF(verdict);
+            if (may_extend_word_with_separators < 0) {
+                goto error;
+            }
+        }
+        if (!(may_extend_word || may_extend_word_with_separators)) {
+            break;
+        }
+    }
+    Py_INCREF(Py_None);
+    *swear_word = Py_None;
+    *end_index = -1;
+
+done:
+    Py_XDECREF(full_word);
+    Py_XDECREF(full_word_with_separators);
+    return 0;
+
+error:
+    Py_XDECREF(full_word);
+    Py_XDECREF(full_word_with_separators);
+    return -1;
+}
+
+/* The arguments of `scan` and `censor` */
+typedef struct {
+    PyObject *text;
+    Py_ssize_t start;
+    Py_ssize_t end;
+    CharacterClass character_class;
+    PyObject *verdicts;
+    PyObject *lookup;
+    PyObject *joined_verdicts;
+    PyObject *lookup_joined;
+    Py_ssize_t max_number_combinations;
+} Scan;
+
+#define SCAN_FORMAT "Unny*y*y*O!OO!On"
+#define SCAN_ARGUMENTS(scan)                                                  \
+    &(scan).text, &(scan).start, &(scan).end, &(scan).character_class.bitmap, \
+    &(scan).character_class.starts, &(scan).character_class.ends,            \
+    &PyDict_Type, &(scan).verdicts, &(scan).lookup, &PyDict_Type,             \
+    &(scan).joined_verdicts, &(scan).lookup_joined,                          \
+    &(scan).max_number_combinations
+
+/*
+ * Find the swear words of text[start:end], or only the first one, as
+ * `Profanity._iter_swear_words_in_wordset` does, and count the tokens whose
+ * verdicts were remembered.
+ */
+static int
+find_swear_words(Scan *scan, int first_only, Matches *matches, Py_ssize_t *hits)
+{
+    PyObject *token, *verdict, *swear_word, *longer_swear_word;
+    Py_ssize_t count, index, end_of_next_words, last_next_word;
+    Py_ssize_t skip_index = -1, word_start, word_end, end_index;
+    Py_ssize_t *bounds = NULL;
+    int may_start_longer_word, failed, result = -1;
+    LoweredText lowered_text = {NULL, 0, 0, NULL};
+
+    if (character_class_init(&scan->character_class) < 0) {
+        return -1;
+    }
+    count = split_text(scan->text, &scan->start, &scan->end,
+                       &scan->character_class, &bounds);
+    if (count < 0) {
+        return -1;
+    }
+    lowered_text.text = scan->text;
+    lowered_text.start = scan->start;
+    lowered_text.end = scan->end;
+
+    /* A single character ending the text is never one of the next words */
+    end_of_next_words = count;
+    if (count > 0 && bounds[2 * (count - 1)] >= scan->end - 1) {
+        end_of_next_words--;
+    }
+    if (end_of_next_words == 0) {
+        result = 0;
+        goto finally;
+    }
+
+    for (index = 0; index < count; index++) {
+        word_start = bounds[2 * index];
+        word_end = bounds[2 * index + 1];
+        if (word_start < skip_index) {
+            continue;
+        }
+
+        token = PyUnicode_Substring(scan->text, word_start, word_end);
+        if (token == NULL) {
+            goto finally;
+        }
+        verdict = get_verdict(scan->verdicts, scan->lookup, token, hits);
+        Py_DECREF(token);
+        if (verdict == NULL) {
+            goto finally;
+        }
+        swear_word = PyTuple_GET_ITEM(verdict, 0);
+        may_start_longer_word = PyObject_IsTrue(PyTuple_GET_ITEM(verdict, 1));
+        if (may_start_longer_word < 0) {
+            Py_DECREF(verdict);
+            goto finally;
+        }
+
+        /* Check if the token combined with its next words forms a swear word,
+           unless it is the last one */
+        if (may_start_longer_word && word_end != scan->end) {
+            last_next_word = index + 1 + scan->max_number_combinations;
+            if (last_next_word > end_of_next_words) {
+                last_next_word = end_of_next_words;
+            }
+            if (look_ahead(&lowered_text, bounds, index, last_next_word,
+                           scan->joined_verdicts, scan->lookup_joined,
+                           &longer_swear_word, &end_index) < 0) {
+                Py_DECREF(verdict);
+                goto finally;
+            }
+            if (longer_swear_word != Py_None) {
+                failed = append_match(matches, word_start, end_index,
+                                      longer_swear_word);
+                Py_DECREF(longer_swear_word);
+                Py_DECREF(verdict);
+                if (failed) {
+                    goto finally;
+                }
+                skip_index = end_index;
+                if (first_only) {
+                    break;
+                }
+                continue;
+            }
+            Py_DECREF(longer_swear_word);
+        }
+
+        if (swear_word == Py_None) {
+            Py_DECREF(verdict);
+            continue;
+        }
+        failed = append_match(matches, word_start, word_end, swear_word);
+        Py_DECREF(verdict);
+        if (failed) {
+            goto finally;
+        }
+        if (first_only) {
+            break;
+        }
+    }
+    result = 0;
+
+finally:
+    Py_XDECREF(lowered_text.lowered_slice);
+    PyMem_RawFree(bounds);
+    return result;
+}
+
+PyDoc_STRVAR(scan_doc,
+"scan(text, start, end, bitmap, starts, ends, verdicts, lookup,\n"
+"     joined_verdicts, lookup_joined, max_number_combinations, match_type,\n"
+"     first_only)\n"
+"--\n\n"
+"Return the matches of the swear words of text[start:end], made by calling\n"
+"`match_type(start, end, word)`, and the number of tokens whose verdicts\n"
+"were found in the dict `verdicts`. The others are looked up by calling\n"
+"`lookup(token)`. The words joined with their next words are looked up in\n"
+"the dict `joined_verdicts`, or else by calling `lookup_joined(string)`.\n"
+"Only the first match is returned if `first_only` is true.");
+
+static PyObject *
+scan(PyObject *module, PyObject *args)
+{
+    Scan scan;
+    Matches matches = {NULL, 0, 0};
+    PyObject *match_type, *match_list = NULL, *match, *result = NULL;
+    Py_ssize_t hits = 0, index;
+    int first_only;
+
+    if (!PyArg_ParseTuple(args, SCAN_FORMAT "Op:scan", SCAN_ARGUMENTS(scan),
+                          &match_type, &first_only)) {
+        return NULL;
+    }
+    if (find_swear_words(&scan, first_only, &matches, &hits) < 0) {
+        goto finally;
+    }
+
+    match_list = PyList_New(matches.count);
+    if (match_list == NULL) {
+        goto finally;
+    }
+    for (index = 0; index < matches.count; index++) {
+        match = PyObject_CallFunction(match_type, "nnO",
+                                      matches.items[index].start,
+                                      matches.items[index].end,
+                                      matches.items[index].word);
+        if (match == NULL) {
+            goto finally;
+        }
+        PyList_SET_ITEM(match_list, index, match);
+    }
+    result = Py_BuildValue("(On)", match_list, hits);
+
+finally:
+    Py_XDECREF(match_list);
+    matches_release(&matches);
+    character_class_release(&scan.character_class);
+    return result;
+}
+
+PyDoc_STRVAR(censor_doc,
+"censor(text, start, end, bitmap, starts, ends, verdicts, lookup,\n"
+"       joined_verdicts, lookup_joined, max_number_combinations, replacement)\n"
+"--\n\n"
+"Return text[start:end] with its swear words, found as `scan` does, replaced\n"
+"by `replacement`, and the number of tokens whose verdicts were found in the\n"
+"dict `verdicts`.");
+
+static PyObject *
+censor(PyObject *module, PyObject *args)
+{
+    Scan scan;
+    Matches matches = {NULL, 0, 0};
+    PyObject *replacement, *parts = NULL, *part, *empty, *censored;
+    PyObject *result = NULL;
+    Py_ssize_t hits = 0, index, end_of_last_match;
+
+    if (!PyArg_ParseTuple(args, SCAN_FORMAT "U:censor", SCAN_ARGUMENTS(scan),
+                          &replacement)) {
+        return NULL;
+    }
+    if (find_swear_words(&scan, 0, &matches, &hits) < 0) {
+        goto finally;
+    }
+
+    /* The unchanged slices between the matches, and their replacements */
+    parts = PyList_New(2 * matches.count + 1);
+    if (parts == NULL) {
+        goto finally;
+    }
+    end_of_last_match = scan.start;
+    for (index = 0; index < matches.count; index++) {
+        part = PyUnicode_Substring(scan.text, end_of_last_match,
+                                   matches.items[index].start);
+        if (part == NULL) {
+            goto finally;
+        }
+        PyList_SET_ITEM(parts, 2 * index, part);
+        Py_INCREF(replacement);
+        PyList_SET_ITEM(parts, 2 * index + 1, replacement);
+        end_of_last_match = matches.items[index].end;
+    }
+    part = PyUnicode_Substring(scan.text, end_of_last_match, scan.end);
+    if (part == NULL) {
+        goto finally;
+    }
+    PyList_SET_ITEM(parts, 2 * matches.count, part);
+
+    empty = PyUnicode_New(0, 0);
+    if (empty == NULL) {
+        goto finally;
+    }
+    censored = PyUnicode_Join(empty, parts);
+    Py_DECREF(empty);
+    if (censored != NULL) {
+        result = Py_BuildValue("(Nn)", censored, hits);
+    }
+
+finally:
+    Py_XDECREF(parts);
+    matches_release(&matches);
+    character_class_release(&scan.character_class);
+    return result;
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"tokenize", tokenize, METH_VARARGS, tokenize_doc},
+    {"scan", scan, METH_VARARGS, scan_doc},
+    {"censor", censor, METH_VARARGS, censor_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "better_profanity._speedups",
+    "The scanner of better_profanity in C.",
+    -1,
+    speedups_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
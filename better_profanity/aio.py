@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+from functools import partial
+
+from .batch import _censor_texts, _contains_profanity_texts, bind_task
+from .constants import INLINE_MAX_LENGTH
+
+
+def run_in_executor(profanity, task, texts, executor=None):
+    """
+    Return an `asyncio.Future` of the results of `task` over the texts, run in
+    the executor from the running event loop.
+
+    Args:
+        profanity (Profanity): Profanity filter used by the task.
+        task (function): Either `_censor_texts` or `_contains_profanity_texts`,
+            with its other arguments bound.
+        texts (list): Texts to process.
+        executor (Executor): Executor to run the task in. `None` for the
+            default executor of the event loop.
+    """
+    # Imported here, as `asyncio` takes longer to import than the package
+    import asyncio
+
+    if executor is not None:
+        task = bind_task(profanity, task, executor)
+    else:
+        task = partial(task, profanity=profanity)
+    return asyncio.get_event_loop().run_in_executor(executor, task, texts)
+
+
+class ProfanityBatcher:
+    """
+    Censors the texts of concurrent coroutines in batches, so that all the
+    texts awaited at the same time take a single round trip to the executor.
+    """
+
+    def __init__(self, profanity, executor=None, max_batch_size=256, max_delay=0.001):
+        """
+        Args:
+            profanity (Profanity): Profanity filter to censor the texts with.
+            executor (Executor): Executor to censor the batches in. `None` for
+                the default executor of the event loop. Process pools must
+                be created with `Profanity.create_executor`.
+            max_batch_size (int): Number of texts after which a batch is sent.
+            max_delay (float): Seconds a text waits for others to join its batch.
+        """
+        self.profanity = profanity
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        # Maps the task of each pending batch to its texts and their futures
+        self._batches = {}
+
+    async def censor(self, text, censor_char="*"):
+        """Replace the swear words in the text with `censor_char`."""
+        if not isinstance(text, str):
+            text = str(text)
+        if not isinstance(censor_char, str):
+            censor_char = str(censor_char)
+        return await self._submit(("censor", censor_char), text)
+
+    async def contains_profanity(self, text):
+        """Return True if the input text has any swear words."""
+        if not isinstance(text, str):
+            text = str(text)
+        return await self._submit(("contains_profanity",), text)
+
+    def _submit(self, task_key, text):
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        batch = self._batches.get(task_key)
+        if batch is None:
+            batch = self._batches[task_key] = []
+            loop.call_later(self.max_delay, self._flush, task_key, batch)
+        batch.append((text, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(task_key, batch)
+        return future
+
+    def _flush(self, task_key, batch):
+        # The batch may already have been sent, once it was full
+        if self._batches.get(task_key) is not batch:
+            return
+        del self._batches[task_key]
+
+        if task_key[0] == "censor":
+            task = partial(_censor_texts, censor_char=task_key[1])
+        else:
+            task = _contains_profanity_texts
+        results = run_in_executor(
+            self.profanity, task, [text for text, _ in batch], self.executor
+        )
+        results.add_done_callback(partial(_set_results, batch))
+
+
+def _set_results(batch, results):
+    for index, (_, future) in enumerate(batch):
+        # The coroutine awaiting the text may have been cancelled
+        if future.done():
+            continue
+        if results.cancelled():
+            future.cancel()
+        elif results.exception() is not None:
+            future.set_exception(results.exception())
+        else:
+            future.set_result(results.result()[index])
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+import os
+from collections import deque, namedtuple
+from functools import partial
+from itertools import count, islice
+
+EXECUTORS = ("process", "thread")
+
+# The filter of a pool made by `create_pool`, kept as its `_profanity_filter`,
+# with the snapshot of its words the workers were last sent, as pickled
+# `payload` of the given `version`
+_PoolFilter = namedtuple("_PoolFilter", ["profanity", "snapshot", "version", "payload"])
+_versions = count(1)
+
+# The `Profanity` shipped to a worker process by `_init_worker`, or reloaded by
+# `_run_with_filter` once the filter changed, and its version
+_worker_profanity = None
+_worker_version = None
+
+
+def _init_worker(profanity, version):
+    global _worker_profanity, _worker_version
+    _worker_profanity = profanity
+    _worker_version = version
+
+
+def _run_with_filter(version, payload, task, texts):
+    global _worker_profanity, _worker_version
+    if _worker_version != version:
+        # Imported here, as only the workers of changed filters need it
+        from pickle import loads
+
+        _worker_profanity = loads(payload)
+        _worker_version = version
+    return task(texts)
+
+
+def _censor_texts(texts, censor_char, profanity=None):
+    profanity = _worker_profanity if profanity is None else profanity
+    return [profanity.censor(text, censor_char) for text in texts]
+
+
+def _contains_profanity_texts(texts, profanity=None):
+    profanity = _worker_profanity if profanity is None else profanity
+    return [profanity.contains_profanity(text) for text in texts]
+
+
+def iter_chunks(iterable, chunksize):
+    """Yield lists of at most `chunksize` items from the iterable."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunksize))
+
+
+def create_pool(profanity, workers=None, executor="process"):
+    """
+    Return a pool of workers which censor with `profanity`.
+
+    Args:
+        profanity (Profanity): Profanity filter used by the workers.
+        workers (int): Number of workers. `None` for the number of CPUs.
+        executor (str): `"process"` or `"thread"`.
+
+    Raises:
+        ValueError: If an argument is not valid.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            "executor must be one of {executors}, but '{executor}' found.".format(
+                executors=", ".join(EXECUTORS), executor=executor
+            )
+        )
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers and chunksize must be positive integers.")
+
+    # `concurrent.futures` takes longer to import than the rest of the package
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    version = next(_versions)
+    if executor == "process":
+        # The filter is pickled once per worker, instead of once per task
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(profanity, version),
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    pool._profanity_filter = _PoolFilter(profanity, profanity._snapshot, version, None)
+    return pool
+
+
+def bind_task(profanity, task, pool):
+    """
+    Bind `task` to `profanity`, unless it runs in a process pool whose workers
+    were given the filter by `create_pool`. Once the words of the filter have
+    changed, the tasks carry them, and the workers reload the filter once.
+
+    Raises:
+        ValueError: If the pool was created by `create_pool` for another filter,
+            or is a process pool which was not created by it.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool_filter = getattr(pool, "_profanity_filter", None)
+    if pool_filter is not None and pool_filter.profanity is not profanity:
+        raise ValueError("executor was created for another Profanity filter.")
+    if not isinstance(pool, ProcessPoolExecutor):
+        return partial(task, profanity=profanity)
+    if pool_filter is None:
+        raise ValueError(
+            "process pools must be created with Profanity.create_executor."
+        )
+
+    snapshot = profanity._snapshot
+    if snapshot is not pool_filter.snapshot:
+        # Imported here, as only changed filters are sent again
+        from pickle import dumps
+
+        # The filter is pickled once per change, instead of once per task
+        pool_filter = pool._profanity_filter = _PoolFilter(
+            profanity, snapshot, next(_versions), dumps(profanity)
+        )
+    if pool_filter.payload is None:
+        return task
+    return partial(_run_with_filter, pool_filter.version, pool_filter.payload, task)
+
+
+def map_in_pool(profanity, task, texts, workers, chunksize, ordered, executor):
+    """
+    Run `task` over chunks of the texts in a pool of workers, with only a few
+    chunks pending at a time.
+
+    Args:
+        profanity (Profanity): Profanity filter used by the workers.
+        task (function): Either `_censor_texts` or `_contains_profanity_texts`,
+            with its other arguments bound.
+        texts (Iterable): Texts to process.
+        workers (int): Number of workers. `None` for the number of CPUs.
+        chunksize (int): Number of texts sent to a worker at a time.
+        ordered (bool): Whether to yield the results in the order of `texts`.
+        executor (str): `"process"` or `"thread"`.
+
+    Returns:
+        Iterator of the results if `ordered`, else of `(index, result)` pairs
+        in the order the results are ready.
+
+    Raises:
+        ValueError: If an argument is not valid.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize < 1:
+        raise ValueError("workers and chunksize must be positive integers.")
+    pool = create_pool(profanity, workers, executor)
+    task = bind_task(profanity, task, pool)
+
+    chunks = enumerate(iter_chunks(texts, chunksize))
+    if ordered:
+        return _iter_ordered_results(pool, task, chunks, workers * 2)
+    return _iter_unordered_results(pool, task, chunks, workers * 2, chunksize)
+
+
+def _iter_ordered_results(pool, task, chunks, max_pending):
+    with pool:
+        pending = deque()
+        for _, chunk in chunks:
+            pending.append(pool.submit(task, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _iter_unordered_results(pool, task, chunks, max_pending, chunksize):
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    with pool:
+        pending = {}
+        chunks_left = True
+        while chunks_left or pending:
+            while chunks_left and len(pending) < max_pending:
+                index, chunk = next(chunks, (None, None))
+                if chunk is None:
+                    chunks_left = False
+                    break
+                pending[pool.submit(task, chunk)] = index * chunksize
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start_index = pending.pop(future)
+                yield from enumerate(future.result(), start_index)
@@ -1,58 +1,214 @@
 # -*- coding: utf-8 -*-
 
+from _thread import allocate_lock
+from collections import Counter, namedtuple
 from collections.abc import Iterable
-
-from .constants import ALLOWED_CHARACTERS
+from functools import partial
+from itertools import takewhile
+from warnings import warn
+
+from . import constants, speedups
+from .batch import _censor_texts, _contains_profanity_texts, create_pool, map_in_pool
+from .cache import ResultCache, TokenVerdicts
+from .character_class import CharacterClass
+from .compiled import CompiledWordlist, load_default_compiled_wordlist
 from .utils import (
     any_next_words_form_swear_word,
     get_complete_path_of_file,
     get_replacement_for_swear_word,
     read_wordlist,
 )
-from .varying_string import VaryingString
+from .wordset import CensorWordset
+
+ENGINES = ("wordset", "trie")
+
+# Held while the words to censor are updated, so that no update is lost
+_update_lock = allocate_lock()
+
+
+class ProfanityMatch(namedtuple("ProfanityMatch", ["start", "end", "word"])):
+    """A swear word found in `text[start:end]`, as a variant of `word`."""
+
+    __slots__ = ()
+
+
+class _Snapshot(
+    namedtuple(
+        "_Snapshot",
+        [
+            "wordset",
+            "trie",
+            "max_number_combinations",
+            "combination_counts",
+            "allowed_characters",
+            "cache",
+            "token_verdicts",
+            "stats",
+        ],
+    )
+):
+    """
+    The words to censor and how to split texts into words, which are replaced
+    as a whole on every change, so that a text is censored with a single one.
+    The caches of the results only hold the results of this snapshot, while
+    the stats of the scans, if enabled, are kept by the next ones.
+
+    `combination_counts` counts the words by their number of characters which
+    are not allowed, so that removing words can lower `max_number_combinations`.
+    It is `None` until the words of a compiled wordlist are first updated.
+    """
+
+    __slots__ = ()
 
 
 class Profanity:
-    def __init__(self, words=None):
+    def __init__(
+        self,
+        words=None,
+        engine="wordset",
+        allowed_characters=None,
+        token_memo_size=65536,
+        prefix_length=4,
+        chars_mapping=None,
+    ):
         """
         Args:
-            words (Iterable/str): Collection of words or file path for a list of
-                words to censor. `None` to use the default word list.
+            words (Iterable/str/CompiledWordlist): Collection of words, file path
+                for a list of words, or compiled wordlist to censor. `None` to use
+                the default word list.
+            engine (str): `"wordset"` to look up each word and its next words
+                in the indexed wordset, or `"trie"` to walk them through a
+                character trie of the wordlist.
+            allowed_characters (Iterable/CharacterClass): Characters which make
+                up words, everything else separates them. `None` for the
+                letters, digits and the characters of leetspeak.
+            token_memo_size (int): Maximum number of tokens whose verdicts are
+                remembered across texts, until the words to censor change.
+                `0` to look up every token.
+            prefix_length (int): Number of first characters of the words kept
+                to reject the tokens which start none of them before looking
+                them up. `0` to look up every token.
+            chars_mapping (dict): Maps the characters of words to the
+                characters which stand for them in texts, themselves included.
+                `None` for the common substitutions of leetspeak.
 
         Raises:
-            TypeError: If `words` is not a valid type.
+            TypeError: If `words` or `chars_mapping` is not a valid type.
+            ValueError: If `engine` is not a valid engine, or `chars_mapping`
+                is not the one `words` was compiled with.
             FileNotFoundError: If `words` is a `str` and is not a valid file path.
         """
         if (
             words is not None
             and not isinstance(words, str)
             and not isinstance(words, Iterable)
+            and not isinstance(words, CompiledWordlist)
         ):
-            raise TypeError("words must be of type str, list, or None")
-        self.CENSOR_WORDSET = []
-        self.CHARS_MAPPING = {
-            "a": ("a", "@", "*", "4"),
-            "i": ("i", "*", "l", "1"),
-            "o": ("o", "*", "0", "@"),
-            "u": ("u", "*", "v"),
-            "v": ("v", "*", "u"),
-            "l": ("l", "1"),
-            "e": ("e", "*", "3"),
-            "s": ("s", "$", "5"),
-            "t": ("t", "7"),
+            raise TypeError(
+                "words must be of type str, list, CompiledWordlist, or None"
+            )
+        if engine not in ENGINES:
+            raise ValueError(
+                "engine must be one of {engines}, but '{engine}' found.".format(
+                    engines=", ".join(ENGINES), engine=engine
+                )
+            )
+        if words is None and allowed_characters is None and chars_mapping is None:
+            # The default filter takes the characters and substitutions from the
+            # compiled default wordlist, which the tests check are the default ones
+            words = load_default_compiled_wordlist()
+        if isinstance(words, CompiledWordlist) and chars_mapping is None:
+            chars_mapping = words.char_map
+        elif chars_mapping is None:
+            chars_mapping = {
+                "a": ("a", "@", "*", "4"),
+                "i": ("i", "*", "l", "1"),
+                "o": ("o", "*", "0", "@"),
+                "u": ("u", "*", "v"),
+                "v": ("v", "*", "u"),
+                "l": ("l", "1"),
+                "e": ("e", "*", "3"),
+                "s": ("s", "$", "5"),
+                "t": ("t", "7"),
+            }
+        elif not isinstance(chars_mapping, dict):
+            raise TypeError("chars_mapping must be of type dict or None")
+        # The substitutes are shared by the `VaryingString`s as tuples
+        chars_mapping = {
+            char: tuple(substitutes) for char, substitutes in chars_mapping.items()
         }
-        self.MAX_NUMBER_COMBINATIONS = 1
-        self.ALLOWED_CHARACTERS = ALLOWED_CHARACTERS
+        if isinstance(words, CompiledWordlist) and chars_mapping != words.char_map:
+            raise ValueError(
+                "chars_mapping must be the one the wordlist was compiled with."
+            )
+        self.engine = engine
+        self.CHARS_MAPPING = chars_mapping
+        if isinstance(words, CompiledWordlist) and allowed_characters is None:
+            allowed_characters = words.allowed_characters
+        elif allowed_characters is None:
+            allowed_characters = constants.ALLOWED_CHARACTERS
+        elif not isinstance(allowed_characters, CharacterClass):
+            allowed_characters = CharacterClass.from_characters(allowed_characters)
+        self._prefix_length = prefix_length
+        wordset = CensorWordset(
+            char_map=self.CHARS_MAPPING, prefix_length=self._prefix_length
+        )
+        self._snapshot = _Snapshot(
+            wordset=wordset,
+            trie=None,
+            max_number_combinations=1,
+            combination_counts=Counter(),
+            allowed_characters=allowed_characters,
+            cache=None,
+            token_verdicts=TokenVerdicts(wordset, token_memo_size),
+            stats=None,
+        )
+        self._whitelist_words = set()
         self._default_wordlist_filename = get_complete_path_of_file(
             "profanity_wordlist.txt"
         )
         if type(words) == str:
             self.load_censor_words_from_file(words)
+        elif isinstance(words, CompiledWordlist):
+            self._load_compiled_wordlist(words)
         else:
             self.load_censor_words(custom_words=words)
 
     ## PUBLIC ##
 
+    @property
+    def CENSOR_WORDSET(self):
+        return self._snapshot.wordset
+
+    @CENSOR_WORDSET.setter
+    def CENSOR_WORDSET(self, wordset):
+        self._publish(wordset=wordset, combination_counts=None)
+
+    @property
+    def CENSOR_TRIE(self):
+        return self._snapshot.trie
+
+    @CENSOR_TRIE.setter
+    def CENSOR_TRIE(self, trie):
+        self._publish(trie=trie)
+
+    @property
+    def MAX_NUMBER_COMBINATIONS(self):
+        return self._snapshot.max_number_combinations
+
+    @MAX_NUMBER_COMBINATIONS.setter
+    def MAX_NUMBER_COMBINATIONS(self, max_number_combinations):
+        self._publish(max_number_combinations=max_number_combinations)
+
+    @property
+    def ALLOWED_CHARACTERS(self):
+        return self._snapshot.allowed_characters
+
+    @ALLOWED_CHARACTERS.setter
+    def ALLOWED_CHARACTERS(self, allowed_characters):
+        # The words are counted again by their characters which are not allowed
+        self._publish(allowed_characters=allowed_characters, combination_counts=None)
+
     def censor(self, text, censor_char="*"):
         """Replace the swear words in the text with `censor_char`."""
 
@@ -61,9 +217,89 @@ class Profanity:
         if not isinstance(censor_char, str):
             censor_char = str(censor_char)
 
-        if not self.CENSOR_WORDSET:
-            self.load_censor_words()
-        return self._hide_swear_words(text, censor_char)
+        snapshot = self._snapshot
+        if snapshot.cache is None:
+            return self._hide_swear_words(text, censor_char, snapshot)
+
+        censored_text = snapshot.cache.get((text, censor_char))
+        if censored_text is None:
+            censored_text = self._hide_swear_words(text, censor_char, snapshot)
+            snapshot.cache.put((text, censor_char), text, censored_text)
+        return censored_text
+
+    def iter_matches(self, text):
+        """Yield a `ProfanityMatch` for each swear word in the text, in order."""
+
+        if not isinstance(text, str):
+            text = str(text)
+
+        yield from self._iter_swear_words(text, self._snapshot)
+
+    def find_spans(self, text):
+        """Return the start and end indices of the swear words in the text."""
+        return [(match.start, match.end) for match in self.iter_matches(text)]
+
+    def iter_censor(self, chunks, censor_char="*"):
+        """
+        Censor a text given as an iterable of chunks, and yield it censored in chunks.
+
+        Only the last words read are held back, until it is known whether they
+        form a swear word with the words of the next chunks.
+        """
+        if not isinstance(censor_char, str):
+            censor_char = str(censor_char)
+
+        # The whole text is censored with the words to censor when it started
+        snapshot = self._snapshot
+        word_pattern = snapshot.allowed_characters.word_pattern
+        buffer = ""
+        in_long_word = False
+        for chunk in chunks:
+            # The rest of a word too long to be a swear word is left as it is
+            if in_long_word:
+                match = word_pattern.match(chunk)
+                end_idx = match.end() if match else 0
+                in_long_word = end_idx == len(chunk)
+                if end_idx > 0:
+                    yield chunk[:end_idx]
+                if in_long_word:
+                    continue
+                chunk = chunk[end_idx:]
+
+            buffer += chunk
+            end_idx, in_long_word = self._get_end_index_of_decided_text(
+                buffer, snapshot
+            )
+            matches = list(
+                takewhile(
+                    lambda match: match.start < end_idx,
+                    self._iter_swear_words(buffer, snapshot),
+                )
+            )
+            if matches:
+                end_idx = max(end_idx, matches[-1].end)
+            if end_idx > 0:
+                yield self._censor_matches(buffer[:end_idx], matches, censor_char)
+                buffer = buffer[end_idx:]
+
+        if buffer:
+            yield self._censor_matches(
+                buffer, self._iter_swear_words(buffer, snapshot), censor_char
+            )
+
+    def censor_stream(self, reader, writer, censor_char="*", chunk_size=65536):
+        """
+        Censor the text read from a file-like object, and write it to another one.
+
+        Args:
+            reader: Object with a `read(size)` method returning `str`.
+            writer: Object with a `write(str)` method.
+            censor_char (str): Character to replace the swear words with.
+            chunk_size (int): Number of characters read at a time.
+        """
+        chunks = iter(partial(reader.read, chunk_size), "")
+        for censored_chunk in self.iter_censor(chunks, censor_char):
+            writer.write(censored_chunk)
 
     def load_censor_words_from_file(self, filename, **kwargs):
         words = read_wordlist(filename)
@@ -71,21 +307,327 @@ class Profanity:
 
     def load_censor_words(self, custom_words=None, **kwargs):
         """Generate a set of words that need to be censored."""
+        # Load the compiled `profanity_wordlist.txt`, if it was compiled the same way
+        if not custom_words and not kwargs.get("whitelist_words"):
+            compiled_wordlist = load_default_compiled_wordlist()
+            if (
+                compiled_wordlist is not None
+                and compiled_wordlist.char_map == self.CHARS_MAPPING
+                and compiled_wordlist.allowed_characters == self.ALLOWED_CHARACTERS
+            ):
+                self._load_compiled_wordlist(compiled_wordlist)
+                return
+
         # Replace the words from `profanity_wordlist.txt` with a custom list
         custom_words = custom_words or read_wordlist(self._default_wordlist_filename)
         self._populate_words_to_wordset(custom_words, **kwargs)
 
+    def compile(self):
+        """Return the words to censor as a `CompiledWordlist`, which can be saved."""
+        snapshot = self._snapshot
+        buckets, unbucketed_words = snapshot.wordset.index()
+        return CompiledWordlist(
+            buckets,
+            unbucketed_words,
+            self.CHARS_MAPPING,
+            snapshot.allowed_characters,
+            snapshot.max_number_combinations,
+        )
+
+    @classmethod
+    def load_compiled(cls, filename, **kwargs):
+        """
+        Create a `Profanity` from a compiled wordlist file, written by
+        `Profanity.compile().save(filename)`.
+
+        Raises:
+            FileNotFoundError: If `filename` is not a valid file path.
+            ValueError: If the file is not a compiled wordlist.
+        """
+        return cls(CompiledWordlist.load(filename), **kwargs)
+
     def add_censor_words(self, custom_words):
+        """Add words to censor, except the whitelisted ones."""
         if not isinstance(custom_words, (list, tuple, set)):
             raise TypeError(
                 "Function 'add_censor_words' only accepts list, tuple or set."
             )
-        for w in custom_words:
-            self.CENSOR_WORDSET.append(VaryingString(w, char_map=self.CHARS_MAPPING))
+        self._update_censor_words(added_words=custom_words)
+
+    def remove_censor_words(self, words):
+        """Stop censoring the given words."""
+        if not isinstance(words, (list, tuple, set)):
+            raise TypeError(
+                "Function 'remove_censor_words' only accepts list, tuple or set."
+            )
+        self._update_censor_words(removed_words=words)
+
+    def add_whitelist_words(self, words):
+        """Stop censoring the given words, and never censor them if added again."""
+        if not isinstance(words, (list, tuple, set)):
+            raise TypeError(
+                "Function 'add_whitelist_words' only accepts list, tuple or set."
+            )
+        self._update_censor_words(removed_words=words, whitelist_words=words)
+
+    def overlay(self, words=(), whitelist_words=(), token_memo_size=None):
+        """
+        Return a new `Profanity` which censors the words of this one and
+        `words`, except `whitelist_words`. It looks up the words of this one
+        instead of copying them, so it only takes memory for its own words.
+        It keeps censoring the words this one has now, even once they change.
+        Its results are not cached nor measured until `enable_cache` or
+        `enable_stats` is called.
+
+        Args:
+            words (list/tuple/set): More words to censor.
+            whitelist_words (list/tuple/set): Words to never censor.
+            token_memo_size (int): Maximum number of tokens whose verdicts are
+                remembered. `None` for the same as this one.
+
+        Raises:
+            TypeError: If `words` or `whitelist_words` is not a valid type.
+        """
+        snapshot = self._snapshot
+        if token_memo_size is None:
+            token_memo_size = snapshot.token_verdicts.max_size
+        wordset = CensorWordset(
+            char_map=self.CHARS_MAPPING,
+            prefix_length=self._prefix_length,
+            base=snapshot.wordset,
+        )
+
+        profanity = self.__class__.__new__(self.__class__)
+        profanity.engine = self.engine
+        profanity.CHARS_MAPPING = self.CHARS_MAPPING
+        profanity._prefix_length = self._prefix_length
+        profanity._whitelist_words = set(self._whitelist_words)
+        profanity._default_wordlist_filename = self._default_wordlist_filename
+        profanity._snapshot = snapshot._replace(
+            wordset=wordset,
+            trie=snapshot.trie.copy() if snapshot.trie is not None else None,
+            cache=None,
+            token_verdicts=TokenVerdicts(wordset, token_memo_size),
+            stats=None,
+        )
+        if whitelist_words:
+            profanity.add_whitelist_words(whitelist_words)
+        if words:
+            profanity.add_censor_words(words)
+        return profanity
 
     def contains_profanity(self, text):
         """Return True if  the input text has any swear words."""
-        return text != self.censor(text)
+        if not isinstance(text, str):
+            text = str(text)
+
+        snapshot = self._snapshot
+        if snapshot.cache is None:
+            return self._contains_swear_words(text, snapshot)
+
+        profane = snapshot.cache.get((text, None))
+        if profane is None:
+            profane = self._contains_swear_words(text, snapshot)
+            snapshot.cache.put((text, None), text, profane)
+        return profane
+
+    def enable_cache(
+        self, max_entries=4096, max_bytes=16 * 1024 * 1024, max_tokens=None
+    ):
+        """
+        Cache the results of `censor` and `contains_profanity` for repeated texts.
+        The cache is emptied whenever the words to censor change.
+
+        Args:
+            max_entries (int): Maximum number of texts whose results are cached.
+                The least recently used results are evicted first.
+            max_bytes (int): Maximum size of the cached texts and results, in bytes.
+            max_tokens (int): Deprecated, use the `token_memo_size` argument of
+                `Profanity` instead. Maximum number of tokens whose verdicts
+                are remembered.
+        """
+        fields = {"cache": ResultCache(max_entries, max_bytes)}
+        if max_tokens is not None:
+            warn(
+                "max_tokens is deprecated, use the token_memo_size argument "
+                "of Profanity instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            fields["token_verdicts"] = TokenVerdicts(self._snapshot.wordset, max_tokens)
+        self._publish(**fields)
+
+    def disable_cache(self):
+        """Stop caching results, and drop the cached ones."""
+        self._publish(cache=None)
+
+    def cache_info(self):
+        """
+        Return the counters and sizes of the memo of the verdicts of tokens,
+        of the prefixes of the words, and of the cache of results if it is
+        enabled, as a dict. The counters are kept when the words to censor change.
+        """
+        snapshot = self._snapshot
+        info = snapshot.token_verdicts.info()
+        info.update(snapshot.wordset.prefix_info())
+        if snapshot.cache is not None:
+            info.update(snapshot.cache.info())
+        return info
+
+    def enable_stats(self, callback=None):
+        """
+        Measure the texts scanned by `censor` and `contains_profanity`: their
+        characters and tokens, the tokens looked up, the candidates compared
+        with the words to censor, the matches, and the time taken to split
+        them into tokens, to match them, and to build the censored texts.
+
+        Until it is called, scans are not measured and take no extra time.
+        Filters sent to worker processes do not measure their scans.
+
+        Args:
+            callback (callable): Called with the measurements of each scan as
+                a dict, with its `"operation"`, to report them elsewhere.
+        """
+        # Imported here, as scans are only measured once stats are enabled
+        from .stats import ScanStats
+
+        self._publish(stats=ScanStats(callback))
+
+    def disable_stats(self):
+        """Stop measuring the scans, and drop their stats."""
+        self._publish(stats=None)
+
+    def stats_info(self):
+        """
+        Return the numbers of calls, the total counters and the cumulative
+        times of the phases of the scans as a dict, or `None` if they are
+        not measured.
+        """
+        stats = self._snapshot.stats
+        return stats.info() if stats is not None else None
+
+    def censor_many(
+        self,
+        texts,
+        censor_char="*",
+        workers=None,
+        chunksize=256,
+        ordered=True,
+        executor="process",
+    ):
+        """
+        Censor many texts in a pool of workers.
+
+        Args:
+            texts (Iterable): Texts to censor.
+            censor_char (str): Character to replace the swear words with.
+            workers (int): Number of workers. `None` for the number of CPUs.
+            chunksize (int): Number of texts sent to a worker at a time.
+            ordered (bool): Whether to yield the censored texts in the order of `texts`.
+            executor (str): `"process"` for a process pool, which the wordlist is
+                sent to once per worker, or `"thread"` for a thread pool.
+
+        Returns:
+            Iterator of the censored texts if `ordered`, else of
+            `(index, censored_text)` pairs in the order they are censored.
+
+        Raises:
+            ValueError: If `workers`, `chunksize` or `executor` is not valid.
+        """
+        task = partial(_censor_texts, censor_char=censor_char)
+        return map_in_pool(self, task, texts, workers, chunksize, ordered, executor)
+
+    def contains_profanity_many(
+        self, texts, workers=None, chunksize=256, ordered=True, executor="process"
+    ):
+        """
+        Check if many texts have any swear words, in a pool of workers.
+
+        Takes the same arguments as `censor_many`, and returns an iterator of
+        booleans instead of censored texts.
+        """
+        return map_in_pool(
+            self,
+            _contains_profanity_texts,
+            texts,
+            workers,
+            chunksize,
+            ordered,
+            executor,
+        )
+
+    def create_executor(self, workers=None, executor="process"):
+        """
+        Return an executor for `acensor`, `acontains_profanity` and
+        `ProfanityBatcher`, whose workers censor with this filter, and with
+        its words as they are when each text is sent.
+
+        Args:
+            workers (int): Number of workers. `None` for the number of CPUs.
+            executor (str): `"process"` for a process pool, which the wordlist is
+                sent to once per worker, or `"thread"` for a thread pool.
+
+        Raises:
+            ValueError: If `workers` or `executor` is not valid.
+        """
+        return create_pool(self, workers, executor)
+
+    async def acensor(
+        self,
+        text,
+        censor_char="*",
+        executor=None,
+        inline_max_length=constants.INLINE_MAX_LENGTH,
+    ):
+        """
+        Replace the swear words in the text with `censor_char`, without blocking
+        the event loop for long texts.
+
+        Args:
+            text (str): Text to censor.
+            censor_char (str): Character to replace the swear words with.
+            executor (Executor): Executor to censor the texts longer than
+                `inline_max_length` in. `None` for the default executor of the
+                event loop. Process pools must be created with `create_executor`.
+            inline_max_length (int): Length up to which texts are censored in
+                the event loop.
+
+        Raises:
+            ValueError: If `executor` was created by `create_executor` of
+                another filter, or is a process pool it did not create.
+        """
+        if not isinstance(text, str):
+            text = str(text)
+        if not isinstance(censor_char, str):
+            censor_char = str(censor_char)
+
+        if len(text) <= inline_max_length:
+            return self.censor(text, censor_char)
+        # Imported here, as only the coroutines need it
+        from .aio import run_in_executor
+
+        task = partial(_censor_texts, censor_char=censor_char)
+        (censored_text,) = await run_in_executor(self, task, [text], executor)
+        return censored_text
+
+    async def acontains_profanity(
+        self, text, executor=None, inline_max_length=constants.INLINE_MAX_LENGTH
+    ):
+        """
+        Return True if the input text has any swear words, without blocking the
+        event loop for long texts. Takes the same arguments as `acensor`.
+        """
+        if not isinstance(text, str):
+            text = str(text)
+
+        if len(text) <= inline_max_length:
+            return self.contains_profanity(text)
+        from .aio import run_in_executor
+
+        (profane,) = await run_in_executor(
+            self, _contains_profanity_texts, [text], executor
+        )
+        return profane
 
     ## PRIVATE ##
 
@@ -107,24 +649,158 @@ class Profanity:
                 )
             whitelist_words[index] = word.lower()
 
-        # Populate the words into an internal wordset
+        # Populate the words into an internal wordset, in their order, which
+        # decides the word a variant of several words is reported as
         whitelist_words = set(whitelist_words)
-        all_censor_words = []
-        for word in set(words):
+        all_censor_words = {}
+        combination_counts = Counter()
+        for word in words:
             # All words in CENSOR_WORDSET must be in lowercase
             word = word.lower()
 
-            if word in whitelist_words:
+            if word in whitelist_words or word in all_censor_words:
                 continue
 
-            num_of_non_allowed_chars = self._count_non_allowed_characters(word)
-            if num_of_non_allowed_chars > self.MAX_NUMBER_COMBINATIONS:
-                self.MAX_NUMBER_COMBINATIONS = num_of_non_allowed_chars
+            combination_counts[self._count_non_allowed_characters(word)] += 1
+            all_censor_words[word] = None
+
+        # The words are kept as strings, and only get `VaryingString`s once
+        # looked up, so the default wordlist takes less than 1MB of memory
+        wordset = CensorWordset(
+            all_censor_words,
+            char_map=self.CHARS_MAPPING,
+            prefix_length=self._prefix_length,
+        )
+        trie = None
+        if self.engine == "trie":
+            # Imported here, as only the trie engine needs it
+            from .trie import WordTrie
+
+            trie = WordTrie(all_censor_words, char_map=self.CHARS_MAPPING)
+        self._publish(
+            wordset=wordset,
+            trie=trie,
+            max_number_combinations=max(combination_counts, default=1) or 1,
+            combination_counts=combination_counts,
+            whitelist_words=whitelist_words,
+        )
+
+    def _update_censor_words(
+        self, added_words=(), removed_words=(), whitelist_words=()
+    ):
+        """
+        Add and remove words to censor, in copies of the wordset and trie which
+        replace them once updated, so that `censor` never sees a partial update.
+        """
+        with _update_lock:
+            snapshot = self._snapshot
+            wordset = snapshot.wordset.copy()
+            trie = snapshot.trie.copy() if snapshot.trie is not None else None
+            combination_counts = snapshot.combination_counts
+            if combination_counts is None:
+                combination_counts = Counter(
+                    map(self._count_non_allowed_characters, snapshot.wordset)
+                )
+            else:
+                combination_counts = combination_counts.copy()
+            self._whitelist_words = self._whitelist_words | {
+                word.lower() for word in whitelist_words
+            }
+
+            # The words are only counted if the wordset changes its size,
+            # as it ignores the words it has, or does not have
+            for word in removed_words:
+                word = word.lower()
+                size = len(wordset)
+                wordset.remove(word)
+                if len(wordset) < size:
+                    combination_counts[self._count_non_allowed_characters(word)] -= 1
+                if trie is not None:
+                    trie.remove(word)
+
+            for word in added_words:
+                # All words in CENSOR_WORDSET must be in lowercase
+                word = word.lower()
+                if word in self._whitelist_words:
+                    continue
+                size = len(wordset)
+                wordset.add(word)
+                if len(wordset) > size:
+                    combination_counts[self._count_non_allowed_characters(word)] += 1
+                if trie is not None:
+                    trie.add(word)
+
+            combination_counts = +combination_counts
+            self._replace_snapshot(
+                wordset=wordset,
+                trie=trie,
+                max_number_combinations=max(combination_counts, default=1) or 1,
+                combination_counts=combination_counts,
+            )
+
+    def _publish(self, whitelist_words=None, **fields):
+        """Replace the snapshot with a copy of it, with the given fields changed."""
+        with _update_lock:
+            if whitelist_words is not None:
+                self._whitelist_words = whitelist_words
+            self._replace_snapshot(**fields)
+
+    def _replace_snapshot(self, **fields):
+        # The cached results of the previous snapshot are no longer valid
+        snapshot = self._snapshot._replace(**fields)
+        if snapshot.cache is not None and "cache" not in fields:
+            snapshot = snapshot._replace(cache=snapshot.cache.cleared())
+        if snapshot.token_verdicts.wordset is not snapshot.wordset:
+            snapshot = snapshot._replace(
+                token_verdicts=snapshot.token_verdicts.cleared(snapshot.wordset)
+            )
+        self._snapshot = snapshot
+
+    def _load_compiled_wordlist(self, compiled_wordlist):
+        self.CHARS_MAPPING = compiled_wordlist.char_map
+        wordset = CensorWordset.from_index(
+            compiled_wordlist.buckets,
+            compiled_wordlist.unbucketed_words,
+            char_map=self.CHARS_MAPPING,
+            prefix_length=self._prefix_length,
+        )
+        trie = None
+        if self.engine == "trie":
+            from .trie import WordTrie
+
+            trie = WordTrie(wordset, char_map=self.CHARS_MAPPING)
+        self._publish(
+            wordset=wordset,
+            trie=trie,
+            max_number_combinations=max(compiled_wordlist.max_number_combinations, 1),
+            combination_counts=None,
+            whitelist_words=set(),
+        )
+
+    def _get_end_index_of_decided_text(self, text, snapshot):
+        """
+        Return the index before which no swear word can continue past the end of
+        the text, and whether the text ends with a word too long to be a swear word.
 
-            all_censor_words.append(VaryingString(word, char_map=self.CHARS_MAPPING))
+        A swear word starting at a word spans at most `MAX_NUMBER_COMBINATIONS`
+        next words, and no more characters than the longest swear word.
+        """
+        tokens = snapshot.allowed_characters.tokenize(text)
+        first_undecided_index = len(tokens)
+        length_of_words = 0
+        for index in range(
+            len(tokens) - 1,
+            max(len(tokens) - 2 - snapshot.max_number_combinations, -1),
+            -1,
+        ):
+            length_of_words += len(tokens[index][0])
+            if length_of_words > snapshot.wordset.max_length:
+                break
+            first_undecided_index = index
 
-        # The default wordlist takes ~5MB+ of memory
-        self.CENSOR_WORDSET = all_censor_words
+        if first_undecided_index < len(tokens):
+            return tokens[first_undecided_index][1], False
+        return len(text), bool(tokens) and tokens[-1][2] == len(text)
 
     def _count_non_allowed_characters(self, word):
         count = 0
@@ -133,124 +809,166 @@ class Profanity:
                 count += 1
         return count
 
-    def _update_next_words_indices(self, text, words_indices, start_idx):
-        """Return a list of next words_indices after the input index."""
-        if not words_indices:
-            words_indices = self._get_next_words(
-                text, start_idx, self.MAX_NUMBER_COMBINATIONS
+    def _hide_swear_words(self, text, censor_char, snapshot):
+        """Replace the swear words with censor characters."""
+        if snapshot.stats is not None:
+            from .stats import scan
+
+            return scan(self, text, snapshot, censor_char)
+        if speedups.extension is not None and self.engine == "wordset":
+            return self._scan_with_speedups(
+                speedups.extension.censor,
+                text,
+                snapshot,
+                0,
+                len(text),
+                get_replacement_for_swear_word(censor_char),
             )
-        else:
-            del words_indices[:2]
-            if words_indices and words_indices[-1][0] != "":
-                words_indices += self._get_next_words(text, words_indices[-1][1], 1)
-        return words_indices
+        return self._censor_matches(
+            text, self._iter_swear_words(text, snapshot), censor_char
+        )
 
-    def _hide_swear_words(self, text, censor_char):
-        """Replace the swear words with censor characters."""
-        censored_text = ""
-        cur_word = ""
-        skip_index = -1
-        next_words_indices = []
-        start_idx_of_next_word = self._get_start_index_of_next_word(text, 0)
+    def _censor_matches(self, text, matches, censor_char, start=0, end=None):
+        """
+        Build the censored `text[start:end]` from the unchanged slices between
+        the matches.
+        """
+        censored_parts = []
+        end_of_last_match = start
+        for start_idx, end_idx, _ in matches:
+            censored_parts.append(text[end_of_last_match:start_idx])
+            censored_parts.append(get_replacement_for_swear_word(censor_char))
+            end_of_last_match = end_idx
+        censored_parts.append(text[end_of_last_match:end])
+        return "".join(censored_parts)
+
+    def _contains_swear_words(self, text, snapshot):
+        if snapshot.stats is not None:
+            from .stats import scan
+
+            return scan(self, text, snapshot)
+        if speedups.extension is not None and self.engine == "wordset":
+            matches = self._scan_with_speedups(
+                speedups.extension.scan,
+                text,
+                snapshot,
+                0,
+                len(text),
+                ProfanityMatch,
+                True,
+            )
+            return bool(matches)
+        for _ in self._iter_swear_words(text, snapshot):
+            return True
+        return False
 
-        # If there are no words in the text, return the raw text without parsing
-        if start_idx_of_next_word >= len(text) - 1:
-            return text
+    def _iter_swear_words(self, text, snapshot, start=0, end=None):
+        """
+        Yield a `ProfanityMatch` for each swear word in `text[start:end]`, with
+        their indices in `text`.
+        """
+        if end is None:
+            end = len(text)
+        if speedups.extension is not None and self.engine == "wordset":
+            return iter(
+                self._scan_with_speedups(
+                    speedups.extension.scan,
+                    text,
+                    snapshot,
+                    start,
+                    end,
+                    ProfanityMatch,
+                    False,
+                )
+            )
+        tokens = snapshot.allowed_characters.tokenize(text, start, end)
+        if self.engine == "trie":
+            return self._iter_swear_words_in_trie(tokens, end, snapshot)
+        return self._iter_swear_words_in_wordset(tokens, end, snapshot)
 
-        # Left strip the text, to avoid inaccurate parsing
-        if start_idx_of_next_word > 0:
-            censored_text = text[:start_idx_of_next_word]
-            text = text[start_idx_of_next_word:]
+    def _scan_with_speedups(self, function, text, snapshot, start, end, *args):
+        """
+        Call a function of the scanner in C on `text[start:end]`, with the
+        characters and verdicts of the snapshot, and count its hits.
+        """
+        allowed_characters = snapshot.allowed_characters
+        token_verdicts = snapshot.token_verdicts
+        result, hits = function(
+            text,
+            start,
+            end,
+            allowed_characters._bitmap,
+            allowed_characters._starts,
+            allowed_characters._ends,
+            token_verdicts._verdicts,
+            token_verdicts.lookup,
+            token_verdicts._joined_verdicts,
+            token_verdicts.lookup_joined,
+            snapshot.max_number_combinations,
+            *args
+        )
+        token_verdicts.hits += hits
+        return result
 
-        # Splitting each word in the text to compare with censored words
-        for index, char in iter(enumerate(text)):
-            if index < skip_index:
-                continue
-            if char in ALLOWED_CHARACTERS:
-                cur_word += char
-                continue
+    def _iter_swear_words_in_wordset(self, tokens, end_of_text, snapshot):
+        """Yield the swear words, looking up each word and its next words."""
+        lookup_token = snapshot.token_verdicts.lookup
 
-            # Skip continuous non-allowed characters
-            if cur_word.strip() == "":
-                censored_text += char
-                cur_word = ""
+        # A single character ending the text is never one of the next words
+        end_of_next_words = len(tokens)
+        if tokens and tokens[-1][1] >= end_of_text - 1:
+            end_of_next_words -= 1
+
+        # If there are no words in the text, return without parsing
+        if end_of_next_words == 0:
+            return
+
+        skip_index = -1
+        for index, (cur_word, start_idx, end_idx, _) in enumerate(tokens):
+            if start_idx < skip_index:
                 continue
+            swear_word, may_start_longer_word = lookup_token(cur_word)
 
             # Iterate the next words combined with the current one
-            # to check if it forms a swear word
-            next_words_indices = self._update_next_words_indices(
-                text, next_words_indices, index
-            )
-            contains_swear_word, end_index = any_next_words_form_swear_word(
-                cur_word, next_words_indices, self.CENSOR_WORDSET
-            )
-            if contains_swear_word:
-                cur_word = get_replacement_for_swear_word(censor_char)
-                skip_index = end_index
-                char = ""
-                next_words_indices = []
+            # to check if it forms a swear word, unless it is the last one
+            if may_start_longer_word and end_idx != end_of_text:
+                next_words = tokens[
+                    index
+                    + 1 : min(
+                        index + 1 + snapshot.max_number_combinations, end_of_next_words
+                    )
+                ]
+                longer_swear_word, end_index = any_next_words_form_swear_word(
+                    cur_word, next_words, snapshot.wordset
+                )
+                if longer_swear_word is not None:
+                    yield ProfanityMatch(start_idx, end_index, longer_swear_word)
+                    skip_index = end_index
+                    continue
 
             # If the current a swear word
-            if cur_word.lower() in self.CENSOR_WORDSET:
-                cur_word = get_replacement_for_swear_word(censor_char)
-
-            censored_text += cur_word + char
-            cur_word = ""
-
-        # Final check
-        if cur_word != "" and skip_index < len(text) - 1:
-            if cur_word.lower() in self.CENSOR_WORDSET:
-                cur_word = get_replacement_for_swear_word(censor_char)
-            censored_text += cur_word
-        return censored_text
-
-    def _get_start_index_of_next_word(self, text, start_idx):
-        """Return the index of the first character of the next word in the given text."""
-        start_idx_of_next_word = len(text)
-        for index in iter(range(start_idx, len(text))):
-            if text[index] not in self.ALLOWED_CHARACTERS:
-                continue
-            start_idx_of_next_word = index
-            break
-
-        return start_idx_of_next_word
-
-    def _get_next_word_and_end_index(self, text, start_idx):
-        """Return the next word in the given text, and the index of its last character."""
-        next_word = ""
-        index = start_idx
-        for index in iter(range(start_idx, len(text))):
-            char = text[index]
-            if char in self.ALLOWED_CHARACTERS:
-                next_word += char
+            if swear_word is not None:
+                yield ProfanityMatch(start_idx, end_idx, swear_word)
+
+    def _iter_swear_words_in_trie(self, tokens, end_of_text, snapshot):
+        """Yield the swear words, walking each word and its next words in the trie."""
+        # A single character ending the text is never one of the next words
+        end_of_next_words = len(tokens)
+        if tokens and tokens[-1][1] >= end_of_text - 1:
+            end_of_next_words -= 1
+
+        # If there are no words in the text, return without parsing
+        if end_of_next_words == 0:
+            return
+
+        index = 0
+        while index < len(tokens):
+            last_index, swear_word = snapshot.trie.match(
+                tokens, index, snapshot.max_number_combinations, end_of_next_words
+            )
+            if last_index < 0:
+                index += 1
                 continue
-            break
-        return next_word, index
-
-    def _get_next_words(self, text, start_idx, num_of_next_words=1):
-        """
-        Return a list of pairs of next words and next words included with separators,
-        combined with their end indices.
-        For example: Word `hand_job` has next words pairs: `job`, `_job`.
-        """
-
-        # Find the starting index of the next word
-        start_idx_of_next_word = self._get_start_index_of_next_word(text, start_idx)
-
-        # Return an empty string if there are no other words
-        if start_idx_of_next_word >= len(text) - 1:
-            return [("", start_idx_of_next_word), ("", start_idx_of_next_word)]
-
-        # Combine the  words into a list
-        next_word, end_index = self._get_next_word_and_end_index(
-            text, start_idx_of_next_word
-        )
-
-        words = [
-            (next_word, end_index),
-            ("%s%s" % (text[start_idx:start_idx_of_next_word], next_word), end_index),
-        ]
-        if num_of_next_words > 1:
-            words.extend(self._get_next_words(text, end_index, num_of_next_words - 1))
 
-        return words
+            yield ProfanityMatch(tokens[index][1], tokens[last_index][2], swear_word)
+            index = last_index + 1
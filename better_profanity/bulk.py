@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+from itertools import islice
+
+# Number of texts joined into a single string at a time
+CHUNK_SIZE = 65536
+
+# Length up to which texts are checked for words which may start a swear word
+# before being scanned, as longer texts almost always have some
+SCREEN_MAX_LENGTH = 100
+
+# Whether each text has swear words, how many, and the censored texts
+BulkResult = namedtuple("BulkResult", ["flags", "counts", "censored"])
+
+
+def score(texts, profanity=None, censor=False, censor_char="*", chunk_size=CHUNK_SIZE):
+    """
+    Flag, count and optionally censor the swear words of many texts at once.
+
+    The texts are joined into a single string, or decoded at once from the data
+    buffer of a pyarrow array of ASCII texts, which is split into words in a
+    single pass, so that each text is never made into a `str` of its own.
+
+    Args:
+        texts: pyarrow `StringArray`, `LargeStringArray` or `ChunkedArray` of
+            them, NumPy array of strings, or iterable of strings. Missing
+            texts, `None` or null, have no swear words and stay missing.
+        profanity (Profanity): Profanity filter. `None` for the default one.
+        censor (bool): Whether to censor the texts.
+        censor_char (str): Character to replace the swear words with.
+        chunk_size (int): Number of texts joined into a single string at a time.
+
+    Returns:
+        `BulkResult` of the flags, the numbers of swear words, and the censored
+        texts if `censor` else `None`. They are pyarrow arrays for a pyarrow
+        array, NumPy arrays for a NumPy array, and lists otherwise.
+    """
+    if profanity is None:
+        from . import profanity
+    if not isinstance(censor_char, str):
+        censor_char = str(censor_char)
+
+    flags = []
+    counts = []
+    censored = [] if censor else None
+    snapshot = profanity._snapshot
+    find_words = snapshot.allowed_characters.word_pattern.findall
+    lookup_token = snapshot.token_verdicts.lookup
+
+    # Words which can start no swear word, and words which may. A short text
+    # is only scanned if some of its words may start a swear word.
+    clean_words = set()
+    suspect_words = set()
+
+    module = type(texts).__module__.split(".")[0]
+    if module == "pyarrow":
+        chunks = _iter_arrow_chunks(texts, chunk_size)
+    else:
+        chunks = _iter_chunks(texts, chunk_size)
+    for text, bounds in chunks:
+        if len(clean_words) + len(suspect_words) > chunk_size:
+            clean_words.clear()
+            suspect_words.clear()
+        for bound in bounds:
+            if bound is None:
+                flags.append(False)
+                counts.append(0)
+                if censored is not None:
+                    censored.append(None)
+                continue
+
+            start, end = bound
+            if end - start <= SCREEN_MAX_LENGTH and _is_clean(
+                find_words(text, start, end), clean_words, suspect_words, lookup_token
+            ):
+                matches = ()
+            else:
+                matches = list(profanity._iter_swear_words(text, snapshot, start, end))
+            flags.append(bool(matches))
+            counts.append(len(matches))
+            if censored is not None:
+                censored.append(
+                    profanity._censor_matches(text, matches, censor_char, start, end)
+                )
+
+    if module == "pyarrow":
+        import pyarrow
+
+        return BulkResult(
+            pyarrow.array(flags, type=pyarrow.bool_()),
+            pyarrow.array(counts, type=pyarrow.int32()),
+            pyarrow.array(censored, type=texts.type) if censor else None,
+        )
+    if module == "numpy":
+        import numpy
+
+        return BulkResult(
+            numpy.array(flags, dtype=bool),
+            numpy.array(counts, dtype=numpy.int32),
+            _to_object_array(censored) if censor else None,
+        )
+    return BulkResult(flags, counts, censored)
+
+
+def _is_clean(words, clean_words, suspect_words, lookup_token):
+    """Return True if none of the words may start a swear word."""
+    if not suspect_words.isdisjoint(words):
+        return False
+    if clean_words.issuperset(words):
+        return True
+    for word in set(words).difference(clean_words):
+        if lookup_token(word) == (None, False):
+            clean_words.add(word)
+        else:
+            suspect_words.add(word)
+    return suspect_words.isdisjoint(words)
+
+
+def _iter_chunks(texts, chunk_size):
+    """
+    Yield the texts joined into a single string, `chunk_size` at a time, with
+    the `(start, end)` indices of each text in it, or `None` if it is missing.
+    """
+    iterator = iter(texts)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        parts = []
+        bounds = []
+        end = 0
+        for text in chunk:
+            if text is None or (not isinstance(text, str) and text != text):
+                # `None`, or a float NaN as pandas and NumPy mark missing texts
+                bounds.append(None)
+                continue
+            if not isinstance(text, str):
+                text = str(text)
+            parts.append(text)
+            bounds.append((end, end + len(text)))
+            end += len(text)
+        yield "".join(parts), bounds
+        chunk = list(islice(iterator, chunk_size))
+
+
+def _iter_arrow_chunks(array, chunk_size):
+    """
+    Yield the texts of a pyarrow array decoded from its data buffer, at most
+    `chunk_size` at a time, with the `(start, end)` indices of each text in
+    the decoded string, or `None` if it is null.
+    """
+    import pyarrow
+
+    if isinstance(array, pyarrow.ChunkedArray):
+        for chunk in array.chunks:
+            yield from _iter_arrow_chunks(chunk, chunk_size)
+        return
+    if not (
+        pyarrow.types.is_string(array.type) or pyarrow.types.is_large_string(array.type)
+    ):
+        raise TypeError(
+            "Only arrays of strings can be scored, but '{type}' found.".format(
+                type=array.type
+            )
+        )
+
+    for chunk_start in range(0, len(array), chunk_size):
+        chunk = array.slice(chunk_start, chunk_size)
+        validity, offsets, data = chunk.buffers()
+        offset_format = "q" if pyarrow.types.is_large_string(chunk.type) else "i"
+        offsets = memoryview(offsets).cast(offset_format)[
+            chunk.offset : chunk.offset + len(chunk) + 1
+        ]
+        first, last = offsets[0], offsets[-1]
+        text = str(memoryview(data)[first:last], "utf-8") if data is not None else ""
+
+        # The offsets are in bytes, which are characters in ASCII texts only
+        if len(text) != last - first:
+            yield from _iter_chunks(chunk.to_pylist(), chunk_size)
+            continue
+
+        bitmap = memoryview(validity) if validity is not None else None
+        bounds = []
+        for index in range(len(chunk)):
+            bit = chunk.offset + index
+            if bitmap is not None and not bitmap[bit >> 3] & (1 << (bit & 7)):
+                bounds.append(None)
+            else:
+                bounds.append((offsets[index] - first, offsets[index + 1] - first))
+        yield text, bounds
+
+
+def _to_object_array(items):
+    import numpy
+
+    # Filled in place, as `numpy.array` would make a `str` dtype of them
+    array = numpy.empty(len(items), dtype=object)
+    array[:] = items
+    return array
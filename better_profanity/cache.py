@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from _thread import allocate_lock
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    A thread-safe cache of the results of whole texts, which evicts the least
+    recently used results once it holds too many of them, or too many bytes.
+    """
+
+    def __init__(self, max_entries=4096, max_bytes=16 * 1024 * 1024):
+        """
+        Args:
+            max_entries (int): Maximum number of results.
+            max_bytes (int): Maximum size of the texts and their results, in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = allocate_lock()
+
+    def __reduce__(self):
+        # Copies start empty, as the lock cannot be pickled
+        return self.__class__, (self.max_entries, self.max_bytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cleared(self):
+        """Return an empty cache with the same limits, which keeps the counters."""
+        cache = self.__class__(self.max_entries, self.max_bytes)
+        cache.hits = self.hits
+        cache.misses = self.misses
+        cache.invalidations = self.invalidations + 1
+        return cache
+
+    def get(self, key):
+        """Return the result cached for `key`, or `None`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, text, result):
+        """Cache the result of `text` for `key`, evicting the least recently used."""
+        size = sys.getsizeof(text) + sys.getsizeof(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Verdict of the tokens which start no word
+_REJECTED = (None, False)
+
+
+class TokenVerdicts:
+    """
+    A memo of the verdicts of tokens, in front of a `CensorWordset`: the word
+    each token is a variant of, and whether it may start a longer swear word.
+    Repeated tokens are only lowercased and looked up once, for as long as the
+    words to censor do not change.
+    """
+
+    def __init__(self, wordset, max_size=65536):
+        """
+        Args:
+            wordset (CensorWordset): Words to censor.
+            max_size (int): Maximum number of verdicts. They are all forgotten
+                once there are more. `0` to not remember any.
+        """
+        self.wordset = wordset
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.rejections = 0
+        self._verdicts = {}
+        self._joined_verdicts = {}
+
+    def __reduce__(self):
+        return self.__class__, (self.wordset, self.max_size)
+
+    def __len__(self):
+        return len(self._verdicts)
+
+    def cleared(self, wordset):
+        """Return an empty memo in front of `wordset`, which keeps the counters."""
+        verdicts = self.__class__(wordset, self.max_size)
+        verdicts.hits = self.hits
+        verdicts.misses = self.misses
+        verdicts.rejections = self.rejections
+        return verdicts
+
+    def lookup(self, token):
+        """
+        Return the word that the token is a variant of, or `None`, and False
+        if the token cannot start a swear word of many tokens.
+        """
+        verdict = self._verdicts.get(token)
+        if verdict is not None:
+            self.hits += 1
+            return verdict
+
+        self.misses += 1
+        lowered_token = token.lower()
+        verdict = self._decide(lowered_token)
+        if verdict is _REJECTED:
+            self.rejections += 1
+
+        # Tokens longer than any word are not remembered, so that the memo
+        # takes little memory whatever the size of the tokens
+        if self.max_size and len(lowered_token) <= self.wordset.max_length:
+            if len(self._verdicts) >= self.max_size:
+                self._verdicts.clear()
+            self._verdicts[token] = verdict
+        return verdict
+
+    def lookup_joined(self, string):
+        """
+        Return the verdict of a lowercase string of words joined together, as
+        `lookup` does. They are remembered apart from the tokens, and not
+        counted, so that the counters are those of the pure-Python scanner.
+        """
+        verdict = self._joined_verdicts.get(string)
+        if verdict is not None:
+            return verdict
+
+        verdict = self._decide(string)
+        if self.max_size and len(string) <= self.wordset.max_length:
+            if len(self._joined_verdicts) >= self.max_size:
+                self._joined_verdicts.clear()
+            self._joined_verdicts[string] = verdict
+        return verdict
+
+    def _decide(self, lowered_token):
+        if not self.wordset.may_match(lowered_token):
+            return _REJECTED
+        return (
+            self.wordset.get(lowered_token),
+            self.wordset.may_start_longer_word(lowered_token),
+        )
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {
+            "token_hits": self.hits,
+            "token_misses": self.misses,
+            "token_hit_rate": self.hits / lookups if lookups else 0.0,
+            "token_rejections": self.rejections,
+            "tokens": len(self._verdicts),
+            "max_tokens": self.max_size,
+        }
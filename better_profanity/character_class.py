@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_right
+
+from . import speedups
+
+# Code points below this are looked up in a bitmap, the others in the ranges
+_BITMAP_SIZE = 0x10000
+
+
+class CharacterClass:
+    """
+    A set of characters stored as sorted ranges of code points, which takes a
+    few kilobytes instead of a `set` of every character.
+    """
+
+    def __init__(self, ranges):
+        """
+        Args:
+            ranges (Iterable): Sorted, non-overlapping `(first, last)` pairs of
+                code points of the characters in the class.
+        """
+        self._starts = array("l")
+        self._ends = array("l")
+        self._word_pattern = None
+        self._bitmap = bytearray(_BITMAP_SIZE // 8)
+        for first, last in ranges:
+            self._starts.append(first)
+            self._ends.append(last)
+            for code_point in range(first, min(last + 1, _BITMAP_SIZE)):
+                self._bitmap[code_point >> 3] |= 1 << (code_point & 7)
+
+    @classmethod
+    def from_characters(cls, characters):
+        """Create a character class from an iterable of characters."""
+        ranges = []
+        for code_point in sorted(set(map(ord, characters))):
+            if ranges and ranges[-1][1] == code_point - 1:
+                ranges[-1][1] = code_point
+            else:
+                ranges.append([code_point, code_point])
+        return cls(ranges)
+
+    def __contains__(self, char):
+        code_point = ord(char)
+        if code_point < _BITMAP_SIZE:
+            return bool(self._bitmap[code_point >> 3] & (1 << (code_point & 7)))
+        index = bisect_right(self._starts, code_point) - 1
+        return index >= 0 and code_point <= self._ends[index]
+
+    def __eq__(self, other):
+        if other.__class__ != CharacterClass:
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __iter__(self):
+        for first, last in self.ranges():
+            for code_point in range(first, last + 1):
+                yield chr(code_point)
+
+    def __len__(self):
+        return sum(last - first + 1 for first, last in self.ranges())
+
+    @property
+    def word_pattern(self):
+        """Regular expression matching a run of the characters, in C."""
+        if self._word_pattern is None:
+            # Imported here, as `re` takes longer to import than the package
+            from re import compile, escape
+
+            self._word_pattern = compile(
+                "[{}]+".format(
+                    "".join(
+                        (
+                            escape(chr(first))
+                            if first == last
+                            else "{}-{}".format(escape(chr(first)), escape(chr(last)))
+                        )
+                        for first, last in self.ranges()
+                    )
+                )
+            )
+        return self._word_pattern
+
+    def tokenize(self, text, pos=0, endpos=None):
+        """
+        Split the text into `(word, start, end, separator)` tokens, one for each
+        run of the characters in `text[start:end]`, where `separator` is the
+        text between the word and the previous one.
+
+        Only `text[pos:endpos]` is split, without slicing it, and the indices of
+        the tokens are in `text`.
+        """
+        if endpos is None:
+            endpos = len(text)
+        if speedups.extension is not None:
+            return speedups.extension.tokenize(
+                text, pos, endpos, self._bitmap, self._starts, self._ends
+            )
+        tokens = []
+        end_of_last_word = pos
+        for match in self.word_pattern.finditer(text, pos, endpos):
+            start_idx, end_idx = match.span()
+            tokens.append(
+                (match.group(), start_idx, end_idx, text[end_of_last_word:start_idx])
+            )
+            end_of_last_word = end_idx
+        return tokens
+
+    def ranges(self):
+        """Return the `(first, last)` pairs of code points of the characters."""
+        return list(zip(self._starts, self._ends))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+from . import batch
+from .batch import _censor_texts, _contains_profanity_texts, iter_chunks, map_in_pool
+from .better_profanity import ENGINES, Profanity
+from .utils import read_wordlist
+
+# Lines are read and written as UTF-8, keeping the bytes which are not
+ENCODING = "utf-8"
+ERRORS = "surrogateescape"
+
+
+def _flag_texts(texts, profanity=None):
+    return [
+        "true\n" if flag else "false\n"
+        for flag in _contains_profanity_texts(texts, profanity=profanity)
+    ]
+
+
+def _process_jsonl_texts(texts, fields, censor_char, flag_field, profanity=None):
+    """Censor the fields of JSON objects, one per line, or flag them in `flag_field`."""
+    from json import dumps, loads
+
+    profanity = batch._worker_profanity if profanity is None else profanity
+    results = []
+    for text in texts:
+        if not text.strip():
+            results.append(text)
+            continue
+        try:
+            record = loads(text)
+        except ValueError:
+            raise ValueError("Invalid JSON line: {text!r}".format(text=text[:80]))
+
+        flag = False
+        for field in fields:
+            value = record.get(field) if isinstance(record, dict) else None
+            if not isinstance(value, str):
+                continue
+            if flag_field is not None:
+                flag = flag or profanity.contains_profanity(value)
+            else:
+                record[field] = profanity.censor(value, censor_char)
+        if flag_field is not None and isinstance(record, dict):
+            record[flag_field] = flag
+        results.append(dumps(record, ensure_ascii=False) + "\n")
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="better-profanity",
+        description="Censor or flag the swear words of the lines of files, "
+        "or of the standard input.",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        metavar="FILE",
+        help="files to read, '-' for the standard input (default)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        metavar="FILE",
+        help="file to write, '-' for the standard output (default)",
+    )
+    parser.add_argument(
+        "--flag",
+        action="store_true",
+        help="write 'true' or 'false' for each line instead of censoring it, "
+        "or set the --flag-field of each JSON object",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="read a JSON object per line, and censor or flag its --field",
+    )
+    parser.add_argument(
+        "--field",
+        action="append",
+        dest="fields",
+        metavar="NAME",
+        help="field of the JSON objects to censor, 'text' by default. "
+        "Can be given many times",
+    )
+    parser.add_argument(
+        "--flag-field",
+        default="contains_profanity",
+        metavar="NAME",
+        help="field of the JSON objects set by --flag (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--wordlist",
+        metavar="FILE",
+        help="file of words to censor, one per line, instead of the default ones",
+    )
+    parser.add_argument(
+        "--whitelist",
+        metavar="FILE",
+        help="file of words to never censor, one per line",
+    )
+    parser.add_argument(
+        "--censor-char",
+        default="*",
+        help="character to replace the swear words with (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="wordset",
+        help="matching engine (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of worker processes, 0 for the number of CPUs (default: 1)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1024,
+        metavar="N",
+        help="number of lines sent to a worker at a time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="do not print the throughput to the standard error at the end",
+    )
+    return parser
+
+
+def main(argv=None):
+    """Run the `better-profanity` command, and return its exit status."""
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 0 or args.chunksize < 1:
+        parser.error("--jobs and --chunksize must be positive integers.")
+    if args.fields and not args.jsonl:
+        parser.error("--field can only be used with --jsonl.")
+
+    try:
+        profanity = Profanity(args.wordlist, engine=args.engine)
+        if args.whitelist:
+            profanity.add_whitelist_words(list(read_wordlist(args.whitelist)))
+    except OSError as error:
+        parser.error(str(error))
+
+    if args.jsonl:
+        task = partial(
+            _process_jsonl_texts,
+            fields=args.fields or ["text"],
+            censor_char=args.censor_char,
+            flag_field=args.flag_field if args.flag else None,
+        )
+    elif args.flag:
+        task = _flag_texts
+    else:
+        task = partial(_censor_texts, censor_char=args.censor_char)
+
+    counts = {"lines": 0, "bytes": 0}
+    start = time.perf_counter()
+    try:
+        output = _open_output(args.output)
+        lines = _iter_lines(args.files, counts)
+        if args.jobs == 1:
+            results = _iter_results(profanity, task, lines, args.chunksize)
+        else:
+            results = map_in_pool(
+                profanity,
+                task,
+                lines,
+                args.jobs or None,
+                args.chunksize,
+                ordered=True,
+                executor="process",
+            )
+        try:
+            for result in results:
+                output.write(result.encode(ENCODING, ERRORS))
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+            else:
+                output.flush()
+    except BrokenPipeError:
+        # The output was closed by its reader, like `head`, so nothing is left
+        # to flush to it at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as error:
+        print("better-profanity: error: {}".format(error), file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        _print_stats(counts, time.perf_counter() - start)
+    return 0
+
+
+def _iter_results(profanity, task, lines, chunksize):
+    for chunk in iter_chunks(lines, chunksize):
+        yield from task(chunk, profanity=profanity)
+
+
+def _iter_lines(filenames, counts):
+    """Yield the decoded lines of the files, with their line endings."""
+    for filename in filenames:
+        if filename == "-":
+            input_file = sys.stdin.buffer
+        else:
+            input_file = open(filename, "rb")
+        try:
+            for line in input_file:
+                counts["lines"] += 1
+                counts["bytes"] += len(line)
+                yield line.decode(ENCODING, ERRORS)
+        finally:
+            if input_file is not sys.stdin.buffer:
+                input_file.close()
+
+
+def _open_output(filename):
+    if filename == "-":
+        return sys.stdout.buffer
+    return open(filename, "wb")
+
+
+def _print_stats(counts, elapsed):
+    elapsed = max(elapsed, 1e-9)
+    megabytes = counts["bytes"] / 1024 / 1024
+    print(
+        "{lines} lines, {megabytes:.2f} MB in {elapsed:.2f}s: "
+        "{speed:.2f} MB/s, {lines_speed:.0f} lines/s".format(
+            lines=counts["lines"],
+            megabytes=megabytes,
+            elapsed=elapsed,
+            speed=megabytes / elapsed,
+            lines_speed=counts["lines"] / elapsed,
+        ),
+        file=sys.stderr,
+    )
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import mmap
+import struct
+from zlib import crc32
+
+from .character_class import CharacterClass
+from .utils import get_complete_path_of_file
+
+# File layout: the header, then each section as its length and UTF-8 bytes
+MAGIC = b"BPWL"
+VERSION = 2
+_HEADER = struct.Struct("<4sHII")
+_SECTION_LENGTH = struct.Struct("<I")
+
+# Separators of the words in the index section
+_FIELD_SEPARATOR = "\x00"
+_RECORD_SEPARATOR = "\n"
+
+# Format of a range of code points in the allowed characters section
+_RANGE_FORMAT = "{:x}-{:x}"
+_RANGE_SEPARATOR = ","
+
+DEFAULT_COMPILED_WORDLIST_FILENAME = "profanity_wordlist.bin"
+
+
+def get_wordlist_checksum(filename):
+    """Return the checksum of a wordlist file, to detect stale compiled wordlists."""
+    with open(filename, "rb") as wordlist_file:
+        return crc32(wordlist_file.read())
+
+
+class CompiledWordlist:
+    """
+    A wordlist with its index of words by their keys, ready to be loaded by
+    `Profanity` without processing the words again.
+    """
+
+    def __init__(
+        self,
+        buckets,
+        unbucketed_words,
+        char_map,
+        allowed_characters,
+        max_number_combinations,
+        checksum=0,
+    ):
+        """
+        Args:
+            buckets (dict): Maps the keys of words to tuples of the words.
+            unbucketed_words (list): Words which have no key.
+            char_map (dict): Maps characters to substitute characters.
+            allowed_characters (CharacterClass): Characters which make up words.
+            max_number_combinations (int): Maximum number of next words which
+                form a swear word with a word.
+            checksum (int): Checksum of the wordlist file the words are from.
+        """
+        self.buckets = buckets
+        self.unbucketed_words = unbucketed_words
+        self.char_map = char_map
+        self.allowed_characters = allowed_characters
+        self.max_number_combinations = max_number_combinations
+        self.checksum = checksum
+
+    def save(self, filename):
+        """Write the compiled wordlist to a file."""
+        from json import dumps
+
+        # The words are kept in their order, which decides the word a string
+        # which is a variant of several words is reported as
+        index = _RECORD_SEPARATOR.join(
+            _FIELD_SEPARATOR.join((key,) + tuple(words))
+            for key, words in self.buckets.items()
+        )
+        sections = [
+            index,
+            _RECORD_SEPARATOR.join(self.unbucketed_words),
+            dumps(self.char_map, ensure_ascii=False, sort_keys=True),
+            _RANGE_SEPARATOR.join(
+                _RANGE_FORMAT.format(first, last)
+                for first, last in self.allowed_characters.ranges()
+            ),
+        ]
+        with open(filename, "wb") as compiled_file:
+            compiled_file.write(
+                _HEADER.pack(
+                    MAGIC, VERSION, self.max_number_combinations, self.checksum
+                )
+            )
+            for section in sections:
+                data = section.encode("utf-8")
+                compiled_file.write(_SECTION_LENGTH.pack(len(data)))
+                compiled_file.write(data)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a compiled wordlist from a file.
+
+        Raises:
+            FileNotFoundError: If `filename` is not a valid file path.
+            ValueError: If the file is not a compiled wordlist of this version.
+        """
+        with open(filename, "rb") as compiled_file:
+            with mmap.mmap(compiled_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    return cls._from_bytes(view)
+                except struct.error:
+                    raise ValueError("The compiled wordlist is truncated.")
+                finally:
+                    view.release()
+
+    @classmethod
+    def _from_bytes(cls, data):
+        magic, version, max_number_combinations, checksum = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The file is not a compiled wordlist of this version.")
+
+        sections = []
+        offset = _HEADER.size
+        for _ in range(4):
+            (length,) = _SECTION_LENGTH.unpack_from(data, offset)
+            offset += _SECTION_LENGTH.size
+            if offset + length > len(data):
+                raise struct.error
+            sections.append(str(data[offset : offset + length], "utf-8"))
+            offset += length
+        index, unbucketed_words, char_map, allowed_characters = sections
+
+        from json import loads
+
+        buckets = {}
+        for record in index.split(_RECORD_SEPARATOR) if index else ():
+            key, *words = record.split(_FIELD_SEPARATOR)
+            buckets[key] = tuple(words)
+        return cls(
+            buckets,
+            unbucketed_words.split(_RECORD_SEPARATOR) if unbucketed_words else [],
+            {char: tuple(chars) for char, chars in loads(char_map).items()},
+            CharacterClass(
+                [int(code_point, 16) for code_point in code_points.split("-")]
+                for code_points in allowed_characters.split(_RANGE_SEPARATOR)
+                if code_points
+            ),
+            max_number_combinations,
+            checksum,
+        )
+
+
+def compile_default_wordlist(wordlist_filename):
+    """Write the compiled default wordlist shipped with the package."""
+    from .better_profanity import Profanity
+
+    compiled_wordlist = Profanity(wordlist_filename).compile()
+    compiled_wordlist.checksum = get_wordlist_checksum(wordlist_filename)
+    compiled_wordlist.save(
+        get_complete_path_of_file(DEFAULT_COMPILED_WORDLIST_FILENAME)
+    )
+
+
+def load_default_compiled_wordlist():
+    """
+    Return the compiled default wordlist shipped with the package, or `None` if
+    it is missing. The tests check that it is up to date with the wordlist file,
+    rather than every load.
+    """
+    try:
+        return CompiledWordlist.load(
+            get_complete_path_of_file(DEFAULT_COMPILED_WORDLIST_FILENAME)
+        )
+    except (OSError, ValueError):
+        return None
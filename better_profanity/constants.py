@@ -1,15 +1,50 @@
 # -*- coding: utf-8 -*-
 
+import sys
+from _thread import allocate_lock
 from io import open
-from json import load
-from string import ascii_letters, digits
 
+from .character_class import CharacterClass
 from .utils import get_complete_path_of_file
 
-ALLOWED_CHARACTERS = set(ascii_letters)
-ALLOWED_CHARACTERS.update(set(digits))
-ALLOWED_CHARACTERS.update({"@", "$", "*", '"', "'"})
+# Texts up to this length are censored in the event loop by the coroutines, as
+# they take less time to censor than to send to an executor
+INLINE_MAX_LENGTH = 500
 
-# Pre-load the unicode characters
-with open(get_complete_path_of_file("alphabetic_unicode.json"), "r") as json_file:
-    ALLOWED_CHARACTERS.update(load(json_file))
+
+def load_allowed_characters():
+    """Return the `CharacterClass` of the characters which make up words."""
+    # Imported here, as `json` and `string` take longer to import than the package
+    from json import load
+    from string import ascii_letters, digits
+
+    allowed_characters = set(ascii_letters)
+    allowed_characters.update(set(digits))
+    allowed_characters.update({"@", "$", "*", '"', "'"})
+
+    # Load the unicode characters
+    with open(get_complete_path_of_file("alphabetic_unicode.json"), "r") as json_file:
+        allowed_characters.update(load(json_file))
+    return CharacterClass.from_characters(allowed_characters)
+
+
+if sys.version_info >= (3, 7):
+    _lock = allocate_lock()
+
+    def __getattr__(name):
+        # `ALLOWED_CHARACTERS` is only loaded on first use
+        if name != "ALLOWED_CHARACTERS":
+            raise AttributeError(
+                "module {module!r} has no attribute {name!r}".format(
+                    module=__name__, name=name
+                )
+            )
+        global ALLOWED_CHARACTERS
+        with _lock:
+            if "ALLOWED_CHARACTERS" not in globals():
+                ALLOWED_CHARACTERS = load_allowed_characters()
+        return ALLOWED_CHARACTERS
+
+
+else:
+    ALLOWED_CHARACTERS = load_allowed_characters()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+from _thread import allocate_lock
+from collections import OrderedDict
+
+from .better_profanity import Profanity
+
+
+class ProfanityRegistry:
+    """
+    The profanity filters of many tenants, which all censor the words of a
+    shared base filter, plus their own words and except their own whitelist.
+
+    The filter of a tenant is an `overlay` of the base filter, created on first
+    use, created again once the base filter changes, and evicted once it is the
+    least recently used of more than `max_tenants`. Evicted filters are created
+    again from the words of their tenant, which are kept for every tenant, so
+    the memory taken grows with the words of the tenants, not with their number.
+    """
+
+    def __init__(self, base=None, max_tenants=1024, token_memo_size=4096):
+        """
+        Args:
+            base (Profanity): Filter of the words censored for every tenant.
+                `None` for a filter of the default wordlist.
+            max_tenants (int): Maximum number of filters of tenants kept.
+            token_memo_size (int): Maximum number of tokens whose verdicts are
+                remembered by the filter of each tenant.
+        """
+        if base is None:
+            base = Profanity()
+        self.base = base
+        self.max_tenants = max_tenants
+        self.token_memo_size = token_memo_size
+        self.evictions = 0
+
+        # Maps the tenants to their words and whitelist words, and the tenants
+        # used the most recently to their filters and the snapshot of the base
+        # filter they were created from
+        self._tenants = {}
+        self._filters = OrderedDict()
+        self._lock = allocate_lock()
+
+    def __contains__(self, tenant):
+        return tenant in self._tenants
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def register(self, tenant, words=(), whitelist_words=()):
+        """
+        Register a tenant, or replace its words, to censor the words of the
+        base filter and `words`, except `whitelist_words`.
+
+        Raises:
+            TypeError: If `words` or `whitelist_words` is not a valid type.
+        """
+        for argument in (words, whitelist_words):
+            if not isinstance(argument, (list, tuple, set)):
+                raise TypeError(
+                    "Function 'register' only accepts list, tuple or set of words."
+                )
+        with self._lock:
+            self._tenants[tenant] = (tuple(words), tuple(whitelist_words))
+            self._filters.pop(tenant, None)
+
+    def unregister(self, tenant):
+        """
+        Forget a tenant and its filter.
+
+        Raises:
+            KeyError: If the tenant is not registered.
+        """
+        with self._lock:
+            del self._tenants[tenant]
+            self._filters.pop(tenant, None)
+
+    def get(self, tenant):
+        """
+        Return the filter of a tenant. Changes made to it are lost once it is
+        evicted or the base filter changes, and the words of the tenant should
+        be changed with `register`.
+
+        Raises:
+            KeyError: If the tenant is not registered.
+        """
+        base_snapshot = self.base._snapshot
+        with self._lock:
+            profanity, snapshot = self._filters.get(tenant, (None, None))
+            if snapshot is base_snapshot:
+                self._filters.move_to_end(tenant)
+                return profanity
+            words, whitelist_words = self._tenants[tenant]
+
+        # Created outside of the lock, as other tenants need not wait for it.
+        # The snapshot was taken before, so that changes of the base filter made
+        # meanwhile create the filter again the next time.
+        profanity = self.base.overlay(
+            words, whitelist_words, token_memo_size=self.token_memo_size
+        )
+        with self._lock:
+            if self._tenants.get(tenant) != (words, whitelist_words):
+                # The tenant was registered again, or unregistered, meanwhile
+                return profanity
+            filter_and_snapshot = self._filters.get(tenant)
+            if (
+                filter_and_snapshot is None
+                or filter_and_snapshot[1] is not base_snapshot
+            ):
+                self._filters[tenant] = (profanity, base_snapshot)
+            else:
+                profanity = filter_and_snapshot[0]
+            self._filters.move_to_end(tenant)
+            while len(self._filters) > self.max_tenants:
+                self._filters.popitem(last=False)
+                self.evictions += 1
+        return profanity
+
+    def censor(self, tenant, text, censor_char="*"):
+        """Replace the swear words of a tenant in the text with `censor_char`."""
+        return self.get(tenant).censor(text, censor_char)
+
+    def contains_profanity(self, tenant, text):
+        """Return True if the input text has any swear words of a tenant."""
+        return self.get(tenant).contains_profanity(text)
+
+    def info(self):
+        return {
+            "tenants": len(self._tenants),
+            "filters": len(self._filters),
+            "max_tenants": self.max_tenants,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from os import environ
+
+
+def load_extension():
+    """
+    Return the scanner in C, or `None` to use the pure-Python one, when it was
+    not built or BETTER_PROFANITY_NO_SPEEDUPS is set to a non-empty value.
+    """
+    if environ.get("BETTER_PROFANITY_NO_SPEEDUPS"):
+        return None
+    try:
+        from . import _speedups
+    except ImportError:
+        return None
+    return _speedups
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        # `extension` is only loaded on first use
+        if name != "extension":
+            raise AttributeError(
+                "module {module!r} has no attribute {name!r}".format(
+                    module=__name__, name=name
+                )
+            )
+        global extension
+        extension = load_extension()
+        return extension
+
+
+else:
+    extension = load_extension()
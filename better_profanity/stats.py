@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+from _thread import allocate_lock
+from itertools import islice
+from time import perf_counter
+
+from .cache import _REJECTED
+
+# Totals kept by `ScanStats`, besides the number of calls of each operation
+FIELDS = (
+    "characters",
+    "tokens",
+    "lookups",
+    "candidates",
+    "matches",
+    "tokenize_seconds",
+    "match_seconds",
+    "output_seconds",
+)
+OPERATIONS = ("censor", "contains_profanity")
+
+
+def _disabled():
+    return None
+
+
+class ScanStats:
+    """
+    The counters and cumulative times of the phases of the texts scanned by
+    `censor` and `contains_profanity`: splitting them into tokens, matching the
+    tokens against the words to censor, and building the censored text.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Args:
+            callback (callable): Called with the measurements of each scan, as
+                a dict of the same fields as `info` and its `"operation"`.
+        """
+        self.callback = callback
+        self._totals = dict.fromkeys(
+            tuple(operation + "_calls" for operation in OPERATIONS) + FIELDS, 0
+        )
+        self._lock = allocate_lock()
+
+    def __reduce__(self):
+        # Copies sent to worker processes are disabled, as nothing reads them
+        return _disabled, ()
+
+    def record(self, measurements):
+        """Add the measurements of a scan to the totals, and pass them to the callback."""
+        with self._lock:
+            self._totals[measurements["operation"] + "_calls"] += 1
+            for field in FIELDS:
+                self._totals[field] += measurements[field]
+        if self.callback is not None:
+            self.callback(measurements)
+
+    def info(self):
+        with self._lock:
+            return dict(self._totals)
+
+
+class _CountingVerdicts:
+    """A `TokenVerdicts` which counts the tokens looked up and not remembered."""
+
+    __slots__ = ("_token_verdicts", "lookups", "candidates")
+
+    def __init__(self, token_verdicts):
+        self._token_verdicts = token_verdicts
+        self.lookups = 0
+        self.candidates = 0
+
+    def lookup(self, token):
+        misses = self._token_verdicts.misses
+        verdict = self._token_verdicts.lookup(token)
+        self.lookups += 1
+        if verdict is not _REJECTED and self._token_verdicts.misses != misses:
+            self.candidates += 1
+        return verdict
+
+
+class _CountingWordset:
+    """A `CensorWordset` which counts the strings looked up in it."""
+
+    __slots__ = ("_wordset", "_verdicts")
+
+    def __init__(self, wordset, verdicts):
+        self._wordset = wordset
+        self._verdicts = verdicts
+
+    def get(self, string, default=None):
+        self._verdicts.candidates += 1
+        return self._wordset.get(string, default)
+
+    def may_start_longer_word(self, string):
+        return self._wordset.may_start_longer_word(string)
+
+
+class _CountingTrie:
+    """A `WordTrie` which counts its walks."""
+
+    __slots__ = ("_trie", "_verdicts")
+
+    def __init__(self, trie, verdicts):
+        self._trie = trie
+        self._verdicts = verdicts
+
+    def match(self, tokens, index, max_number_combinations, end_of_next_words=None):
+        self._verdicts.lookups += 1
+        self._verdicts.candidates += 1
+        return self._trie.match(
+            tokens, index, max_number_combinations, end_of_next_words
+        )
+
+
+def scan(profanity, text, snapshot, censor_char=None):
+    """
+    Censor the text with `censor_char`, or return whether it has any swear
+    words if `censor_char` is `None`, and record the measurements in
+    `snapshot.stats`.
+
+    Lookups are the tokens looked up, and candidates the strings which are
+    compared with the words to censor, as they were neither rejected by the
+    prefixes of the words nor remembered. With the trie engine, they are both
+    the walks through the trie.
+    """
+    start = perf_counter()
+    tokens = snapshot.allowed_characters.tokenize(text)
+    tokenized = perf_counter()
+
+    verdicts = _CountingVerdicts(snapshot.token_verdicts)
+    if profanity.engine == "trie":
+        counting_snapshot = snapshot._replace(
+            trie=_CountingTrie(snapshot.trie, verdicts)
+        )
+        iterator = profanity._iter_swear_words_in_trie(
+            tokens, len(text), counting_snapshot
+        )
+    else:
+        counting_snapshot = snapshot._replace(
+            wordset=_CountingWordset(snapshot.wordset, verdicts),
+            token_verdicts=verdicts,
+        )
+        iterator = profanity._iter_swear_words_in_wordset(
+            tokens, len(text), counting_snapshot
+        )
+    if censor_char is None:
+        matches = list(islice(iterator, 1))
+    else:
+        matches = list(iterator)
+    matched = perf_counter()
+
+    if censor_char is None:
+        result = bool(matches)
+    else:
+        result = profanity._censor_matches(text, matches, censor_char)
+    end = perf_counter()
+
+    snapshot.stats.record(
+        {
+            "operation": "contains_profanity" if censor_char is None else "censor",
+            "characters": len(text),
+            "tokens": len(tokens),
+            "lookups": verdicts.lookups,
+            "candidates": verdicts.candidates,
+            "matches": len(matches),
+            "tokenize_seconds": tokenized - start,
+            "match_seconds": matched - tokenized,
+            "output_seconds": end - matched,
+        }
+    )
+    return result
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# Key of a trie node which holds the word ending at that node
+_END = ""
+
+
+def get_reversed_char_map(char_map):
+    """Map each substitute character to the characters it can substitute."""
+    reversed_char_map = {}
+    for char, substitutes in char_map.items():
+        for substitute in substitutes:
+            if len(char) != 1 or len(substitute) != 1:
+                raise ValueError(
+                    "The 'trie' engine only supports single-character substitutions, "
+                    "but '{char}' -> '{substitute}' found.".format(
+                        char=char, substitute=substitute
+                    )
+                )
+            reversed_char_map.setdefault(substitute, [])
+            if char not in reversed_char_map[substitute]:
+                reversed_char_map[substitute].append(char)
+
+    # Characters which are not mapped can only stand for themselves
+    for char in reversed_char_map:
+        if char not in char_map:
+            reversed_char_map[char].append(char)
+    for char in char_map:
+        reversed_char_map.setdefault(char, [])
+    return {char: tuple(chars) for char, chars in reversed_char_map.items()}
+
+
+class WordTrie:
+    """A character trie of words, matching all their variants in a single walk."""
+
+    def __init__(self, words=(), char_map={}):
+        """
+        Args:
+            words (Iterable): Words to censor.
+            char_map (dict): Maps characters to substitute characters.
+
+        Raises:
+            ValueError: If `char_map` has substitutions longer than a character.
+        """
+        self._reversed_char_map = get_reversed_char_map(char_map)
+        self._root = {}
+
+        # Nodes which are shared with other tries, and are copied before
+        # being changed, are not in `_own_nodes`. `None` if all are owned.
+        self._own_nodes = None
+        for word in words:
+            self.add(word)
+
+    def copy(self):
+        """
+        Return a copy of the trie, which can be changed without changing this
+        one. Their nodes are shared, until a word is added or removed through them.
+        """
+        trie = self.__class__.__new__(self.__class__)
+        trie._reversed_char_map = self._reversed_char_map
+        trie._root = dict(self._root)
+        trie._own_nodes = {id(trie._root): trie._root}
+        return trie
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Nodes are owned by their ids, which change once unpickled
+        if self._own_nodes is not None:
+            self._own_nodes = {id(node): node for node in self._own_nodes.values()}
+
+    def add(self, word):
+        node = self._root
+        for char in word:
+            node = self._get_own_child(node, char)
+        node[_END] = word
+
+    def remove(self, word):
+        """Remove a word from the trie, if it is in it."""
+        node = self._root
+        for char in word:
+            if char not in node:
+                return
+            node = self._get_own_child(node, char)
+        node.pop(_END, None)
+
+    def _get_own_child(self, node, char):
+        """Return the child of an owned node, copied first if it is shared."""
+        child = node.get(char)
+        if child is None:
+            child = node[char] = {}
+        elif self._own_nodes is not None and id(child) not in self._own_nodes:
+            child = node[char] = dict(child)
+        else:
+            return child
+        if self._own_nodes is not None:
+            self._own_nodes[id(child)] = child
+        return child
+
+    def walk(self, nodes, string):
+        """Return the nodes reached by following every variant of `string`."""
+        reversed_char_map = self._reversed_char_map
+        for char in string:
+            next_nodes = []
+            for node in nodes:
+                for word_char in reversed_char_map.get(char, (char,)):
+                    child = node.get(word_char)
+                    if child is not None:
+                        next_nodes.append(child)
+            if not next_nodes:
+                return next_nodes
+            nodes = next_nodes
+        return nodes
+
+    def match(self, tokens, index, max_number_combinations, end_of_next_words=None):
+        """
+        Return the index of the last word of the swear word starting at
+        `tokens[index]`, and the swear word. `(-1, None)` if there is none.
+
+        A swear word of many words is matched with its words either joined or
+        separated by the separators in the text, and is preferred over a single word.
+        Only the tokens before `end_of_next_words`, if given, are next words.
+        """
+        if end_of_next_words is None:
+            end_of_next_words = len(tokens)
+        nodes = self.walk([self._root], tokens[index][0].lower())
+        single_word_nodes = nodes
+
+        joined_nodes = separated_nodes = nodes
+        last_index = min(index + max_number_combinations, end_of_next_words - 1)
+        for next_index in range(index + 1, last_index + 1):
+            next_word, _, _, separator = tokens[next_index]
+            next_word = next_word.lower()
+            if joined_nodes:
+                joined_nodes = self.walk(joined_nodes, next_word)
+            if separated_nodes:
+                separated_nodes = self.walk(
+                    self.walk(separated_nodes, separator.lower()), next_word
+                )
+            if not joined_nodes and not separated_nodes:
+                break
+
+            for node in joined_nodes + separated_nodes:
+                if _END in node:
+                    return next_index, node[_END]
+
+        for node in single_word_nodes:
+            if _END in node:
+                return index, node[_END]
+        return -1, None
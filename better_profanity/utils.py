@@ -22,26 +22,43 @@ def get_replacement_for_swear_word(censor_char):
     return censor_char * 4
 
 
-def any_next_words_form_swear_word(cur_word, words_indices, censor_words):
+def any_next_words_form_swear_word(cur_word, next_words, censor_words):
     """
-    Return True, and the end index of the word in the text,
-    if any word formed in words_indices is in `CENSOR_WORDSET`.
+    Return the swear word, and the end index of its last word in the text,
+    if the word combined with any of the next words is in `CENSOR_WORDSET`.
+
+    The words are only combined with the next ones while they may still start
+    a swear word, so that a swear word of many words only makes the texts
+    which start like it look far ahead.
+
+    Args:
+        cur_word (str): Word the swear word starts with.
+        next_words (list): `(word, start, end, separator)` tokens of the words
+            following `cur_word`.
+        censor_words (CensorWordset): Words to censor.
     """
     full_word = cur_word.lower()
-    full_word_with_separators = cur_word.lower()
-
-    # Check both words in the pairs
-    for index in iter(range(0, len(words_indices), 2)):
-        single_word, end_index = words_indices[index]
-        word_with_separators, _ = words_indices[index + 1]
-        if single_word == "":
-            continue
-
-        full_word = "%s%s" % (full_word, single_word.lower())
-        full_word_with_separators = "%s%s" % (
-            full_word_with_separators,
-            word_with_separators.lower(),
-        )
-        if full_word in censor_words or full_word_with_separators in censor_words:
-            return True, end_index
-    return False, -1
+    full_word_with_separators = full_word
+
+    # Check the words both joined and with their separators, while they may
+    # still start a swear word
+    may_extend_word = may_extend_word_with_separators = True
+    for next_word, _, end_index, separator in next_words:
+        next_word = next_word.lower()
+        if may_extend_word:
+            full_word += next_word
+            swear_word = censor_words.get(full_word)
+            if swear_word is not None:
+                return swear_word, end_index
+            may_extend_word = censor_words.may_start_longer_word(full_word)
+        if may_extend_word_with_separators:
+            full_word_with_separators += separator.lower() + next_word
+            swear_word = censor_words.get(full_word_with_separators)
+            if swear_word is not None:
+                return swear_word, end_index
+            may_extend_word_with_separators = censor_words.may_start_longer_word(
+                full_word_with_separators
+            )
+        if not (may_extend_word or may_extend_word_with_separators):
+            break
+    return None, -1
@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 
+# The combinations of the characters which are not substituted, shared by all
+# `VaryingString`s instead of a new tuple for each of their characters
+_UNMAPPED_CHAR_COMBOS = {}
+
 
 class VaryingString:
     """Represents a string with varying character representations."""
 
+    # Without a `__dict__`, each instance takes a fraction of the memory
+    __slots__ = ("_original", "_min_len", "_max_len", "_char_combos")
+
     def __init__(self, string, char_map={}):
         """
         Args:
@@ -18,18 +25,23 @@ class VaryingString:
         self._min_len = 0
         self._max_len = 0
 
-        # Create list of all possible character combinations.
-        self._char_combos = []
+        # Create tuple of all possible character combinations. The tuples of
+        # substitutes are the ones of `char_map`, shared with other strings.
+        char_combos = []
         for char in self._original:
             if char in char_map:
-                self._char_combos.append(char_map[char])
+                char_combos.append(char_map[char])
                 lens = [len(c) for c in char_map[char]]
                 self._min_len += min(lens)
                 self._max_len += max(lens)
             else:
-                self._char_combos.append((char,))
+                combos = _UNMAPPED_CHAR_COMBOS.get(char)
+                if combos is None:
+                    combos = _UNMAPPED_CHAR_COMBOS.setdefault(char, (char,))
+                char_combos.append(combos)
                 self._min_len += 1
                 self._max_len += 1
+        self._char_combos = tuple(char_combos)
 
     def __str__(self):
         return self._original
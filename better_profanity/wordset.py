@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from itertools import product
+
+from .varying_string import VaryingString
+
+_NO_WORDS = frozenset()
+
+# Number of canonical forms a string is looked up by at most, beyond which it
+# is compared with the words of its bucket one by one
+MAX_CANONICAL_FORMS = 8
+
+# The words by their canonical forms, and the tables of the canonical forms of
+# strings, without the canonical characters which none of the words has
+_CanonicalIndex = namedtuple(
+    "_CanonicalIndex",
+    ["words", "string_table", "alternatives", "ambiguous_chars", "chars"],
+)
+
+# Number of changes of a collection kept apart from the index of the words it
+# shares with its copies, beyond which they are merged into a new index
+_MIN_CHANGES = 64
+_CHANGES_PER_WORD = 1 / 64
+
+
+def get_key_table(char_map):
+    """
+    Return a `str.translate` table which maps every character to the
+    representative of the group of characters it can be substituted with.
+
+    Two strings can only be variants of each other if they have the same key.
+    """
+    parents = {}
+
+    def find(char):
+        parents.setdefault(char, char)
+        while parents[char] != char:
+            parents[char] = parents[parents[char]]
+            char = parents[char]
+        return char
+
+    for char, substitutes in char_map.items():
+        for substitute in substitutes:
+            # Substitutions of other lengths are never bucketed
+            if len(char) != 1 or len(substitute) != 1:
+                continue
+            root, other_root = find(char), find(substitute)
+            if root != other_root:
+                parents[max(root, other_root)] = min(root, other_root)
+
+    return {ord(char): find(char) for char in parents if find(char) != char}
+
+
+def get_prefix_variants(char_map):
+    """
+    Map each character which does not only stand for itself to the characters
+    of words it can stand for.
+    """
+    variants = {}
+    for char, substitutes in char_map.items():
+        for substitute in substitutes:
+            if len(char) == 1 and len(substitute) == 1:
+                variants.setdefault(substitute, set()).add(char)
+    # Characters which are not mapped can only stand for themselves
+    for char in variants:
+        if char not in char_map:
+            variants[char].add(char)
+    for char in char_map:
+        variants.setdefault(char, set())
+    return {
+        char: tuple(sorted(chars))
+        for char, chars in variants.items()
+        if chars != {char}
+    }
+
+
+def get_canonical_tables(char_map):
+    """
+    Return the `str.translate` tables of the canonical forms of words and of
+    strings, and the canonical characters that each ambiguous character of
+    strings can stand for.
+
+    Characters of words with the same substitutes, like "u" and "v", share a
+    canonical character. A string is a variant of a word if one of its
+    canonical forms is the canonical form of the word.
+    """
+    # Substitutions of other lengths are never bucketed
+    substitutes_of = {
+        char: frozenset(
+            substitute for substitute in substitutes if len(substitute) == 1
+        )
+        for char, substitutes in char_map.items()
+        if len(char) == 1
+    }
+    chars = set(substitutes_of)
+    for substitutes in substitutes_of.values():
+        chars.update(substitutes)
+    for char in chars:
+        substitutes_of.setdefault(char, frozenset(char))
+
+    canonical_chars = {}
+    for char in sorted(chars):
+        canonical_chars.setdefault(substitutes_of[char], char)
+    word_table = {}
+    for char in chars:
+        if canonical_chars[substitutes_of[char]] != char:
+            word_table[ord(char)] = canonical_chars[substitutes_of[char]]
+
+    string_table = {}
+    alternatives = {}
+    for char in chars:
+        stands_for = {
+            canonical_chars[substitutes]
+            for substitutes in set(substitutes_of.values())
+            if char in substitutes
+        }
+        if len(stands_for) != 1:
+            alternatives[char] = tuple(sorted(stands_for))
+        elif stands_for != {char}:
+            string_table[ord(char)] = stands_for.pop()
+    return word_table, string_table, alternatives
+
+
+class CensorWordset:
+    """
+    A collection of `VaryingString`s, indexed for constant time lookups.
+
+    It can be layered over a base collection, whose words it looks up instead
+    of copying them, so that it only takes memory for the words it adds.
+    """
+
+    def __init__(self, words=(), char_map={}, prefix_length=4, base=None):
+        """
+        Args:
+            words (Iterable): Words to censor.
+            char_map (dict): Maps characters to substitute characters.
+            prefix_length (int): Number of first characters of the words kept
+                to reject strings which start no word. `0` to keep none.
+            base (CensorWordset): Collection of more words to censor, with the
+                same `char_map`. It must not be changed afterwards.
+        """
+        self._char_map = char_map
+        self._key_table = get_key_table(char_map)
+        self.prefix_length = prefix_length
+
+        # The first characters of the words, and the characters of the words
+        # that each substitute character can stand for
+        self._prefixes = set()
+        self._prefix_variants = get_prefix_variants(char_map)
+
+        # The substitutions compiled into translation tables, and the words by
+        # their canonical forms, indexed once a string is looked up
+        (
+            self._word_table,
+            self._string_table,
+            self._canonical_alternatives,
+        ) = get_canonical_tables(char_map)
+        self._canonical_index = None
+
+        # Maps the key of words to tuples of the words. Their `VaryingString`s are only
+        # created once a string with the same key is looked up.
+        self._buckets = {}
+        self._varying_strings = {}
+
+        # Once shared with copies, the buckets, prefixes, sorted keys and
+        # canonical words are no longer changed. The changes are kept apart,
+        # with `()` for the removed words, until there are too many of them.
+        self._shared = False
+        self._changed_buckets = {}
+        self._new_prefixes = set()
+        self._new_keys = []
+        self._changed_canonical_words = {}
+
+        # Words which have variants of different lengths cannot be keyed,
+        # and are compared one by one.
+        self._unbucketed = []
+        self._size = 0
+
+        # The keys in order, to find the keys a string is the start of
+        self._sorted_keys = None
+
+        # The words of the base which were removed from this collection
+        self._base = base
+        self._hidden_words = frozenset()
+
+        # Length of the longest variant of any word
+        self.max_length = base.max_length if base is not None else 0
+        if base is not None:
+            self._size = len(base)
+        for word in words:
+            self.add(word)
+
+    @classmethod
+    def from_index(cls, buckets, unbucketed_words, char_map, prefix_length=4):
+        """Create a collection from the `index()` of another one."""
+        wordset = cls(unbucketed_words, char_map=char_map, prefix_length=prefix_length)
+        # The buckets are shared with the index
+        wordset._buckets = buckets
+        wordset._shared = True
+        wordset._size += sum(len(words) for words in buckets.values())
+        for words in buckets.values():
+            for word in words:
+                wordset._add_prefixes(word)
+        wordset.max_length = max(
+            [wordset.max_length] + [len(key) for key in buckets], default=0
+        )
+        return wordset
+
+    def __contains__(self, string):
+        return self.get(string) is not None
+
+    def __iter__(self):
+        for _, words in self._iter_buckets():
+            yield from words
+        for varying_string in self._unbucketed:
+            yield str(varying_string)
+        if self._base is not None:
+            for word in self._base:
+                if word not in self._hidden_words:
+                    yield word
+
+    def __len__(self):
+        return self._size
+
+    def get(self, string, default=None):
+        """Return the word that `string` is a variant of, or `default`."""
+        if string.__class__ != str:
+            return default
+        word = self._find(string, _NO_WORDS)
+        return default if word is None else word
+
+    def _find(self, string, hidden_words):
+        key = string.translate(self._key_table)
+        bucket = self._get_bucket(key)
+        if bucket:
+            canonical_index = self._canonical_index
+            if canonical_index is None:
+                canonical_index = self._canonical_index = self._index_canonical_words()
+            forms = self._get_canonical_forms(string, canonical_index)
+            if forms is not None:
+                words = [
+                    word
+                    for form in forms
+                    for word in self._get_canonical_words(canonical_index, form)
+                    if word not in hidden_words
+                ]
+                if words:
+                    # The first one in the order of the bucket, as they share it
+                    return min(words, key=bucket.index) if len(words) > 1 else words[0]
+            else:
+                varying_strings = self._varying_strings.get(key)
+                if varying_strings is None:
+                    varying_strings = self._varying_strings[key] = tuple(
+                        VaryingString(word, char_map=self._char_map) for word in bucket
+                    )
+                for varying_string in varying_strings:
+                    if (
+                        varying_string == string
+                        and str(varying_string) not in hidden_words
+                    ):
+                        return str(varying_string)
+        for varying_string in self._unbucketed:
+            if varying_string == string and str(varying_string) not in hidden_words:
+                return str(varying_string)
+        if self._base is not None:
+            return self._base._find(string, hidden_words | self._hidden_words)
+        return None
+
+    def may_start_longer_word(self, string):
+        """
+        Return False if `string` is not the start of a variant of any word
+        longer than it, so that no string starting with it is in the collection.
+        """
+        if string.__class__ != str:
+            return False
+        # Words which have no key cannot be found by their start
+        if self._unbucketed:
+            return True
+
+        # The sorted keys may still have the keys of removed words
+        sorted_keys = self._sorted_keys
+        if sorted_keys is None:
+            sorted_keys = self._sorted_keys = sorted(
+                key for key, _ in self._iter_buckets()
+            )
+        key = string.translate(self._key_table)
+        for keys in (sorted_keys, self._new_keys):
+            index = bisect_right(keys, key)
+            if index < len(keys) and keys[index].startswith(key):
+                return True
+        return self._base is not None and self._base.may_start_longer_word(string)
+
+    def may_match(self, string):
+        """
+        Return False if `string` is too long, or its first characters are not
+        the start of a variant of any word, so that it is neither in the
+        collection nor the start of a word in it. It takes a few set lookups.
+        """
+        # Words which have no key are not kept by their start
+        if not self.prefix_length or self._unbucketed:
+            return True
+        if len(string) > self.max_length:
+            return False
+
+        prefix = string[: self.prefix_length]
+        prefixes = self._prefixes
+        new_prefixes = self._new_prefixes
+        if prefix in prefixes or prefix in new_prefixes:
+            return True
+        prefix_variants = self._prefix_variants
+        if (
+            (prefixes or new_prefixes)
+            and any(char in prefix_variants for char in prefix)
+            and any(
+                variant in prefixes or variant in new_prefixes
+                for variant in map(
+                    "".join,
+                    product(*[prefix_variants.get(char, (char,)) for char in prefix]),
+                )
+            )
+        ):
+            return True
+        return self._base is not None and self._base.may_match(string)
+
+    def prefix_info(self):
+        """Return the number of prefixes kept and their size in bytes, as a dict."""
+        # The prefixes of the base are shared, and not counted
+        return {
+            "prefixes": len(self._prefixes) + len(self._new_prefixes),
+            "prefix_bytes": sys.getsizeof(self._prefixes)
+            + sys.getsizeof(self._new_prefixes)
+            + sum(map(sys.getsizeof, self._prefixes))
+            + sum(map(sys.getsizeof, self._new_prefixes)),
+            "prefix_length": self.prefix_length,
+        }
+
+    def copy(self):
+        """
+        Return a copy of the collection, which can be changed without changing
+        this one. They share the index of their words, and only copy the
+        changes made to it since it was built.
+        """
+        wordset = self.__class__.__new__(self.__class__)
+        wordset.__dict__.update(self.__dict__)
+        self._shared = wordset._shared = True
+        wordset._varying_strings = dict(self._varying_strings)
+        wordset._changed_buckets = dict(self._changed_buckets)
+        wordset._new_prefixes = set(self._new_prefixes)
+        wordset._new_keys = list(self._new_keys)
+        wordset._changed_canonical_words = dict(self._changed_canonical_words)
+        return wordset
+
+    def add(self, word):
+        """Add a word to the collection, if it is not already in it."""
+        if word in self._hidden_words:
+            self._hidden_words = self._hidden_words - {word}
+            self._size += 1
+            return
+        if self._base is not None and self._base._has_word(word):
+            return
+
+        if not self._is_bucketable(word):
+            if all(str(varying_string) != word for varying_string in self._unbucketed):
+                varying_string = VaryingString(word, char_map=self._char_map)
+                self._unbucketed = self._unbucketed + [varying_string]
+                self._size += 1
+                self.max_length = max(self.max_length, varying_string._max_len)
+            return
+
+        key = word.translate(self._key_table)
+        words = self._get_bucket(key)
+        if word not in words:
+            if not words and self._sorted_keys is not None:
+                self._add_sorted_key(key)
+            self._set_bucket(key, words + (word,))
+            self._size += 1
+            self.max_length = max(self.max_length, len(word))
+            self._add_prefixes(word)
+
+            canonical_index = self._canonical_index
+            if canonical_index is not None:
+                form = word.translate(self._word_table)
+                self._set_canonical_words(
+                    form, self._get_canonical_words(canonical_index, form) + (word,)
+                )
+                if not canonical_index.chars.issuperset(form):
+                    self._canonical_index = self._get_canonical_index(
+                        canonical_index.words, canonical_index.chars.union(form)
+                    )
+            self._merge_changes_if_many()
+
+    def remove(self, word):
+        """Remove a word from the collection, if it is in it."""
+        if (
+            self._base is not None
+            and word not in self._hidden_words
+            and self._base._has_word(word)
+        ):
+            self._hidden_words = self._hidden_words | {word}
+            self._size -= 1
+            return
+
+        if not self._is_bucketable(word):
+            unbucketed = [
+                varying_string
+                for varying_string in self._unbucketed
+                if str(varying_string) != word
+            ]
+            self._size -= len(self._unbucketed) - len(unbucketed)
+            self._unbucketed = unbucketed
+            return
+
+        # The prefixes, sorted keys and characters of the canonical forms of
+        # the removed words are kept, as they only make strings looked up
+        key = word.translate(self._key_table)
+        words = self._get_bucket(key)
+        if word in words:
+            self._set_bucket(
+                key, tuple(other_word for other_word in words if other_word != word)
+            )
+            self._size -= 1
+
+            canonical_index = self._canonical_index
+            if canonical_index is not None:
+                form = word.translate(self._word_table)
+                self._set_canonical_words(
+                    form,
+                    tuple(
+                        other_word
+                        for other_word in self._get_canonical_words(
+                            canonical_index, form
+                        )
+                        if other_word != word
+                    ),
+                )
+            self._merge_changes_if_many()
+
+    def index(self):
+        """Return the words by their key, and the words which have no key."""
+        unbucketed_words = [str(word) for word in self._unbucketed]
+        if self._base is None:
+            if self._changed_buckets:
+                return dict(self._iter_buckets()), unbucketed_words
+            return self._buckets, unbucketed_words
+
+        # Merge the words of the base, except the removed ones
+        base_buckets, base_unbucketed_words = self._base.index()
+        buckets = {}
+        for key, words in base_buckets.items():
+            words = tuple(word for word in words if word not in self._hidden_words)
+            if words:
+                buckets[key] = words
+        for key, words in self._iter_buckets():
+            buckets[key] = buckets.get(key, ()) + words
+        unbucketed_words += [
+            word for word in base_unbucketed_words if word not in self._hidden_words
+        ]
+        return buckets, unbucketed_words
+
+    def _has_word(self, word):
+        if word in self._hidden_words:
+            return False
+        if self._is_bucketable(word):
+            if word in self._get_bucket(word.translate(self._key_table)):
+                return True
+        elif any(str(varying_string) == word for varying_string in self._unbucketed):
+            return True
+        return self._base is not None and self._base._has_word(word)
+
+    def _get_canonical_forms(self, string, canonical_index):
+        """Return the canonical forms of the string, or `None` if it has too many."""
+        if canonical_index.ambiguous_chars.isdisjoint(string):
+            return (string.translate(canonical_index.string_table),)
+
+        alternatives = canonical_index.alternatives
+        number_of_forms = 1
+        for char in string:
+            if char in alternatives:
+                number_of_forms *= len(alternatives[char])
+                if number_of_forms > MAX_CANONICAL_FORMS:
+                    return None
+
+        forms = [string.translate(canonical_index.string_table)]
+        for index, char in enumerate(string):
+            if char in alternatives:
+                forms = [
+                    form[:index] + alternative + form[index + 1 :]
+                    for form in forms
+                    for alternative in alternatives[char]
+                ]
+        return forms
+
+    def _get_bucket(self, key):
+        words = self._changed_buckets.get(key)
+        return self._buckets.get(key, ()) if words is None else words
+
+    def _set_bucket(self, key, words):
+        self._varying_strings.pop(key, None)
+        if self._shared:
+            self._changed_buckets[key] = words
+        elif words:
+            self._buckets[key] = words
+        else:
+            del self._buckets[key]
+
+    def _add_sorted_key(self, key):
+        for keys in (self._sorted_keys, self._new_keys):
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                return
+        insort(self._new_keys if self._shared else self._sorted_keys, key)
+
+    def _iter_buckets(self):
+        """Yield the keys and words of the buckets, with their changes."""
+        changed_buckets = self._changed_buckets
+        for key, words in self._buckets.items():
+            words = changed_buckets.get(key, words)
+            if words:
+                yield key, words
+        for key, words in changed_buckets.items():
+            if words and key not in self._buckets:
+                yield key, words
+
+    def _get_canonical_words(self, canonical_index, form):
+        words = self._changed_canonical_words.get(form)
+        return canonical_index.words.get(form, ()) if words is None else words
+
+    def _set_canonical_words(self, form, words):
+        if self._shared:
+            self._changed_canonical_words[form] = words
+        elif words:
+            self._canonical_index.words[form] = words
+        else:
+            self._canonical_index.words.pop(form, None)
+
+    def _merge_changes_if_many(self):
+        """
+        Merge the changes into a new index of the words once there are too many,
+        so that copies take a time which depends on the changes, not on the words.
+        """
+        changes = len(self._changed_buckets)
+        if changes <= _MIN_CHANGES + len(self._buckets) * _CHANGES_PER_WORD:
+            return
+
+        self._buckets = dict(self._iter_buckets())
+        self._changed_buckets = {}
+        self._prefixes = self._prefixes | self._new_prefixes
+        self._new_prefixes = set()
+        if self._sorted_keys is not None:
+            self._sorted_keys = [
+                key
+                for key in sorted(self._sorted_keys + self._new_keys)
+                if key in self._buckets
+            ]
+            self._new_keys = []
+        canonical_index = self._canonical_index
+        if canonical_index is not None:
+            canonical_words = dict(canonical_index.words)
+            for form, words in self._changed_canonical_words.items():
+                if words:
+                    canonical_words[form] = words
+                else:
+                    canonical_words.pop(form, None)
+            self._canonical_index = canonical_index._replace(words=canonical_words)
+        self._changed_canonical_words = {}
+        self._shared = False
+
+    def _index_canonical_words(self):
+        canonical_words = {}
+        for _, words in self._iter_buckets():
+            for word in words:
+                form = word.translate(self._word_table)
+                canonical_words[form] = canonical_words.get(form, ()) + (word,)
+        return self._get_canonical_index(canonical_words, set().union(*canonical_words))
+
+    def _get_canonical_index(self, canonical_words, chars):
+        # Characters which stand for a single character of the words are
+        # translated, instead of making more forms
+        string_table = dict(self._string_table)
+        alternatives = {}
+        for char, stands_for in self._canonical_alternatives.items():
+            stands_for = tuple(other for other in stands_for if other in chars)
+            if len(stands_for) == 1:
+                string_table[ord(char)] = stands_for[0]
+            else:
+                alternatives[char] = stands_for
+        return _CanonicalIndex(
+            canonical_words,
+            string_table,
+            alternatives,
+            frozenset(alternatives),
+            frozenset(chars),
+        )
+
+    def _add_prefixes(self, word):
+        prefixes = self._new_prefixes if self._shared else self._prefixes
+        for length in range(1, min(self.prefix_length, len(word)) + 1):
+            prefix = word[:length]
+            if prefix not in self._prefixes:
+                prefixes.add(prefix)
+
+    def _is_bucketable(self, word):
+        for char in word:
+            for substitute in self._char_map.get(char, (char,)):
+                if len(substitute) != 1:
+                    return False
+        return True
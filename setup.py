@@ -26,7 +26,23 @@ setuptools.setup(
         ("unicode_characters", ["better_profanity/alphabetic_unicode.json"]),
     ],
     package_data={
-        "better_profanity": ["profanity_wordlist.txt", "alphabetic_unicode.json"]
+        "better_profanity": [
+            "profanity_wordlist.txt",
+            "profanity_wordlist.bin",
+            "alphabetic_unicode.json",
+        ]
     },
     include_package_data=True,
+    # The scanner in C is optional: the pure-Python one is used without it
+    ext_modules=[
+        setuptools.Extension(
+            "better_profanity._speedups",
+            ["better_profanity/_speedups.c"],
+            optional=True,
+        )
+    ],
+    extras_require={"bulk": ["numpy", "pyarrow"]},
+    entry_points={
+        "console_scripts": ["better-profanity=better_profanity.cli:main"],
+    },
 )
@@ -2,10 +2,54 @@
 
 import unittest
 
+import asyncio
+import contextlib
+import io
+import pickle
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import better_profanity
-from better_profanity import profanity, Profanity
+from better_profanity import (
+    profanity,
+    CharacterClass,
+    Profanity,
+    ProfanityBatcher,
+    ProfanityMatch,
+    ProfanityRegistry,
+)
+from better_profanity import bulk, cli, speedups
+from better_profanity.constants import load_allowed_characters
+from better_profanity.compiled import (
+    DEFAULT_COMPILED_WORDLIST_FILENAME,
+    CompiledWordlist,
+    get_wordlist_checksum,
+)
+from better_profanity.utils import get_complete_path_of_file
+from better_profanity.varying_string import VaryingString
+from better_profanity.wordset import CensorWordset, get_canonical_tables
 import os
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    from better_profanity import _speedups
+except ImportError:
+    _speedups = None
+
 
 class ProfanityTest(unittest.TestCase):
     def setUp(self):
@@ -17,6 +61,30 @@ class ProfanityTest(unittest.TestCase):
         profane = profanity.contains_profanity("he is a m0th3rf*cker")
         self.assertTrue(profane)
 
+    def test_contains_profanity_of_clean_text(self):
+        self.assertFalse(profanity.contains_profanity("Hi there"))
+        self.assertFalse(profanity.contains_profanity(""))
+
+    def test_iter_matches(self):
+        matches = list(profanity.iter_matches("Those 2 gir1$ 1 cvp, you sh1t"))
+        self.assertEqual(
+            matches,
+            [
+                ProfanityMatch(6, 19, "2 girls 1 cup"),
+                ProfanityMatch(25, 29, "shit"),
+            ],
+        )
+        self.assertEqual(matches[1].word, "shit")
+        self.assertEqual(list(profanity.iter_matches("Hi there")), [])
+
+    def test_find_spans(self):
+        text = "That wh0re gave m3 a very good H4nd j0b."
+        spans = profanity.find_spans(text)
+        self.assertEqual(spans, [(5, 10), (31, 39)])
+        self.assertEqual(
+            [text[start:end] for start, end in spans], ["wh0re", "H4nd j0b"]
+        )
+
     def test_leaves_paragraphs_untouched(self):
         innocent_text = """If you tickle us do we not laugh?
                         If you poison us do we not die?
@@ -108,6 +176,55 @@ class ProfanityTest(unittest.TestCase):
         profanity.add_censor_words(["supremacia ariana"])
         self.assertEqual(profanity.censor(bad_text), censored_text)
 
+    def test_add_censor_words_of_many_words(self):
+        custom_profanity = Profanity(["fuck"])
+        custom_profanity.add_censor_words(["Not A Nice Word"])
+        self.assertEqual(custom_profanity.MAX_NUMBER_COMBINATIONS, 3)
+        self.assertEqual(
+            custom_profanity.censor("This is n0t a nice w0rd"), "This is ****"
+        )
+
+    def test_remove_censor_words(self):
+        custom_profanity = Profanity(["fuck", "shit"])
+        wordset = custom_profanity.CENSOR_WORDSET
+        custom_profanity.remove_censor_words(["Shit", "heck"])
+        self.assertEqual(custom_profanity.censor("fuck, shit"), "****, shit")
+        # The previous wordset is left as it was
+        self.assertTrue("shit" in wordset)
+
+    def test_incremental_updates_like_rebuild(self):
+        text = "a s s. n0t a nice w0rd, you 4ss"
+        updated_profanity = Profanity(["ass", "a s s", "not a nice word"])
+        updated_profanity.remove_censor_words(["a s s", "a s s"])
+        updated_profanity.add_whitelist_words(["not a nice word"])
+        updated_profanity.add_censor_words(["ass", "nice word"])
+        rebuilt_profanity = Profanity(["ass", "nice word"])
+        self.assertEqual(updated_profanity.MAX_NUMBER_COMBINATIONS, 1)
+        self.assertEqual(updated_profanity.censor(text), rebuilt_profanity.censor(text))
+
+        # Also for a compiled wordlist, and overlays hiding words of their base
+        long_word = "not a very nice word at all"
+        profanity = Profanity()
+        profanity.add_censor_words([long_word])
+        self.assertEqual(profanity.MAX_NUMBER_COMBINATIONS, 6)
+        overlay = profanity.overlay(whitelist_words=[long_word])
+        profanity.remove_censor_words([long_word])
+        for updated_profanity in (profanity, overlay):
+            self.assertEqual(
+                updated_profanity.MAX_NUMBER_COMBINATIONS,
+                Profanity().MAX_NUMBER_COMBINATIONS,
+            )
+
+    def test_add_whitelist_words(self):
+        custom_profanity = Profanity(["fuck", "shit"])
+        custom_profanity.add_whitelist_words(["shit"])
+        custom_profanity.add_censor_words(["SHIT", "heck"])
+        self.assertEqual(
+            custom_profanity.censor("fuck, shit, heck"), "****, shit, ****"
+        )
+        with self.assertRaises(TypeError):
+            custom_profanity.add_whitelist_words("shit")
+
     def test_init_with_list(self):
         custom_badwords = ["happy", "jolly", "merry"]
         Profanity(custom_badwords)
@@ -120,6 +237,20 @@ class ProfanityTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             Profanity(False)
 
+    def test_custom_chars_mapping(self):
+        custom_profanity = Profanity(
+            ["shit"], chars_mapping={"s": ["s", "z"], "i": ("i", "!", "1")}
+        )
+        self.assertEqual(custom_profanity.CHARS_MAPPING["s"], ("s", "z"))
+        self.assertEqual(custom_profanity.censor("zh!t sh1t $hit"), "**** **** $hit")
+
+        compiled_wordlist = custom_profanity.compile()
+        self.assertEqual(Profanity(compiled_wordlist).censor("zh!t up"), "**** up")
+        with self.assertRaises(ValueError):
+            Profanity(compiled_wordlist, chars_mapping={"s": ("s",)})
+        with self.assertRaises(TypeError):
+            Profanity(chars_mapping=[("s", "z")])
+
     def test_punctuation(self):
         bad_text = "Holy shit! Oh fuck, damn. What the hell? Shut up, asshole..."
         censored_text = "Holy ****! Oh ****, ****. What the ****? Shut up, ****..."
@@ -212,6 +343,22 @@ class ProfanityWhitelistTest(unittest.TestCase):
         self.assertEqual(profanity.censor(bad_text), bad_text)
 
 
+class ProfanityImportTest(unittest.TestCase):
+    def test_import_is_lazy(self):
+        code = (
+            "import better_profanity, better_profanity.constants as constants\n"
+            "assert 'profanity' not in vars(better_profanity)\n"
+            "assert 'ALLOWED_CHARACTERS' not in vars(constants)\n"
+            "import sys\n"
+            "for module in ['aio', 'registry', 'stats', 'trie', '_speedups']:\n"
+            "    assert 'better_profanity.' + module not in sys.modules\n"
+            "from better_profanity import ProfanityRegistry, profanity\n"
+            "assert profanity is better_profanity.profanity\n"
+            "assert profanity.censor('sh1t') == '****'\n"
+        )
+        subprocess.check_call([sys.executable, "-c", code])
+
+
 class ProfanityFileTest(unittest.TestCase):
     def setUp(self):
         self.maxDiff = None
@@ -225,6 +372,1045 @@ class ProfanityFileTest(unittest.TestCase):
             Profanity("not_found_file.txt")
 
 
+class CensorWordsetTest(unittest.TestCase):
+    def setUp(self):
+        self.char_map = Profanity().CHARS_MAPPING
+
+    def test_matches_varying_string_variants(self):
+        words = ["handjob", "2 girls 1 cup", "son-of-a-bitch"]
+        wordset = CensorWordset(words, char_map=self.char_map)
+        varying_strings = [VaryingString(w, char_map=self.char_map) for w in words]
+        for text in [
+            "h4ndj0b",
+            "h@ndj*b",
+            "2 gir1$ 1 cvp",
+            "$0n-*f-4-b17ch",
+            "handjob",
+        ]:
+            self.assertTrue(text in wordset)
+            self.assertTrue(text in varying_strings)
+        for text in ["handjobs", "hand job", "2 girls 1", "h4ndj0", "", None]:
+            self.assertFalse(text in wordset)
+
+    def test_add_ignores_duplicates(self):
+        wordset = CensorWordset(["fuck"], char_map=self.char_map)
+        wordset.add("fuck")
+        wordset.add("f*ck")
+        self.assertEqual(len(wordset), 2)
+        self.assertEqual(sorted(str(w) for w in wordset), ["f*ck", "fuck"])
+
+    def test_substitutions_of_different_lengths(self):
+        wordset = CensorWordset(
+            ["ass", "ok"], char_map={"s": ("s", "$$"), "o": ("o", "")}
+        )
+        self.assertTrue("a$$$$" in wordset)
+        self.assertTrue("as$$" in wordset)
+        self.assertTrue("k" in wordset)
+        self.assertFalse("a$" in wordset)
+
+    def test_canonical_forms(self):
+        word_table, string_table, alternatives = get_canonical_tables(self.char_map)
+        # "u" and "v" have the same substitutes, and "*" stands for any vowel
+        self.assertEqual("fvck".translate(word_table), "fuck")
+        self.assertEqual("4".translate(string_table), "4")
+        self.assertEqual(alternatives["*"], ("*", "a", "e", "i", "o", "u"))
+
+        wordset = CensorWordset(["shit", "$hit", "fuck"], char_map=self.char_map)
+        self.assertEqual(wordset.get("fvck"), "fuck")
+        self.assertEqual(wordset.get("f*ck"), "fuck")
+        # The first of the words a string is a variant of, in the order added
+        self.assertEqual(wordset.get("$h17"), "shit")
+        # Strings of too many forms are compared with the words one by one
+        self.assertEqual(wordset.get("$h**"), None)
+        self.assertEqual(wordset.get("5h*7"), "shit")
+
+        # Characters which no word has are not looked up as themselves
+        canonical_index = wordset._canonical_index
+        self.assertEqual("5h17".translate(canonical_index.string_table), "shit")
+        self.assertEqual(canonical_index.alternatives["$"], ("$", "s"))
+
+    def test_copies_share_the_index(self):
+        words = ["shit", "fuck", "2 girls 1 cup"]
+        wordset = CensorWordset(words, char_map=self.char_map)
+        self.assertEqual(wordset.get("fvck"), "fuck")
+        self.assertTrue(wordset.may_start_longer_word("2 g1rls"))
+
+        # A few changes are kept apart from the index the copies share
+        copy = wordset.copy()
+        copy.add("frak")
+        copy.remove("fuck")
+        self.assertIs(copy._buckets, wordset._buckets)
+        self.assertIs(copy._canonical_index.words, wordset._canonical_index.words)
+        self.assertEqual((copy.get("fr4k"), copy.get("fvck")), ("frak", None))
+        self.assertEqual((wordset.get("fr4k"), wordset.get("fvck")), (None, "fuck"))
+        self.assertTrue(copy.may_start_longer_word("fr"))
+        self.assertFalse(wordset.may_start_longer_word("fr"))
+
+        # Many changes are merged into a new index
+        words = ["frak{}".format(index) for index in range(500)]
+        for word in words:
+            copy = copy.copy()
+            copy.add(word)
+        self.assertEqual(len(copy), 503)
+        self.assertEqual(
+            sorted(copy), sorted(words + ["frak", "shit", "2 girls 1 cup"])
+        )
+        self.assertEqual(copy.get("fr4k499"), "frak499")
+        self.assertEqual(wordset.get("fr4k499"), None)
+        self.assertEqual(sorted(wordset), ["2 girls 1 cup", "fuck", "shit"])
+
+    def test_varying_strings_share_char_combos(self):
+        first = VaryingString("fuck", char_map=self.char_map)
+        second = VaryingString("fck", char_map=self.char_map)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first._char_combos[1], self.char_map["u"])
+        self.assertIs(first._char_combos[0], second._char_combos[0])
+
+        copy = pickle.loads(pickle.dumps(first))
+        self.assertEqual(str(copy), "fuck")
+        self.assertTrue(copy == "f*ck")
+
+    def test_may_match(self):
+        wordset = CensorWordset(
+            ["handjob", "2 girls 1 cup"], char_map=self.char_map, prefix_length=3
+        )
+        for text in ["h4ndj0b", "h@n", "ha", "h4ndjobx", "2", "handsome"]:
+            self.assertTrue(wordset.may_match(text))
+        for text in ["hello", "g", "girls", "h4ndj0bandmore"]:
+            self.assertFalse(wordset.may_match(text))
+
+        wordset.add("hell")
+        self.assertTrue(wordset.may_match("h3llo"))
+        self.assertEqual(wordset.prefix_info()["prefixes"], 8)
+
+        # Without prefixes, every string may match
+        wordset = CensorWordset(["handjob"], char_map=self.char_map, prefix_length=0)
+        self.assertTrue(wordset.may_match("hello"))
+
+
+class CharacterClassTest(unittest.TestCase):
+    def test_from_characters(self):
+        characters = "abcxyz019@\u0301\U0001d400"
+        character_class = CharacterClass.from_characters(characters)
+        self.assertEqual(
+            character_class.ranges(),
+            [(48, 49), (57, 57), (64, 64), (97, 99), (120, 122), (769, 769)]
+            + [(0x1D400, 0x1D400)],
+        )
+        self.assertEqual(sorted(character_class), sorted(characters))
+        self.assertEqual(len(character_class), len(characters))
+        for char in characters:
+            self.assertTrue(char in character_class)
+        for char in "d2 -_\u0300\U0001d401\U0001d3ff":
+            self.assertFalse(char in character_class)
+
+    def test_word_pattern(self):
+        character_class = load_allowed_characters()
+        self.assertEqual(
+            character_class.word_pattern.findall("Про́сто, a@b$c - x_y!"),
+            ["Про́сто", "a@b$c", "x", "y"],
+        )
+
+    def test_tokenize(self):
+        self.assertEqual(
+            load_allowed_characters().tokenize("-H4nd_ j0b, x"),
+            [("H4nd", 1, 5, "-"), ("j0b", 7, 10, "_ "), ("x", 12, 13, ", ")],
+        )
+        self.assertEqual(load_allowed_characters().tokenize(" ,. "), [])
+
+    def test_custom_allowed_characters(self):
+        custom_profanity = Profanity(allowed_characters=string.ascii_letters + "_")
+        self.assertEqual(
+            custom_profanity.censor("What a shit_head, sh1t"), "What a shit_head, sh1t"
+        )
+        self.assertEqual(
+            profanity.censor("What a shit_head, sh1t"), "What a ****, ****"
+        )
+
+
+class ProfanityBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        profanity.load_censor_words()
+        self.texts = [
+            "That wh0re gave m3 a very good H4nd j0b.",
+            "Hi there",
+            "Those 2 girls 1 cup. You gotta check. ",
+            "",
+        ] * 5
+
+    def test_censor_many(self):
+        censored_texts = [profanity.censor(text) for text in self.texts]
+        for executor in ["process", "thread"]:
+            self.assertEqual(
+                list(
+                    profanity.censor_many(
+                        self.texts, workers=2, chunksize=3, executor=executor
+                    )
+                ),
+                censored_texts,
+            )
+
+    def test_censor_many_unordered(self):
+        results = profanity.censor_many(
+            self.texts, "-", workers=2, chunksize=3, ordered=False
+        )
+        self.assertEqual(
+            sorted(results),
+            [(i, profanity.censor(text, "-")) for i, text in enumerate(self.texts)],
+        )
+
+    def test_contains_profanity_many(self):
+        self.assertEqual(
+            list(profanity.contains_profanity_many(self.texts, workers=2)),
+            [True, False, True, False] * 5,
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            profanity.censor_many(self.texts, executor="cluster")
+        with self.assertRaises(ValueError):
+            profanity.censor_many(self.texts, chunksize=0)
+
+
+class ProfanityAsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.text = "That wh0re gave m3 a very good H4nd j0b."
+        self.censored_text = "That **** gave m3 a very good ****."
+
+    def run_coroutine(self, coroutine):
+        # In a new event loop, as `asyncio.run` needs Python 3.7
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_acensor(self):
+        async def censor():
+            return [
+                await profanity.acensor(self.text),
+                await profanity.acensor(self.text, inline_max_length=0),
+                await profanity.acontains_profanity(self.text, inline_max_length=0),
+                await profanity.acontains_profanity("Hi there", inline_max_length=0),
+            ]
+
+        self.assertEqual(
+            self.run_coroutine(censor()),
+            [self.censored_text, self.censored_text, True, False],
+        )
+
+    def test_acensor_in_executors(self):
+        for executor in ["thread", "process"]:
+            with profanity.create_executor(workers=1, executor=executor) as pool:
+                censored_text = self.run_coroutine(
+                    profanity.acensor(self.text, executor=pool, inline_max_length=0)
+                )
+            self.assertEqual(censored_text, self.censored_text)
+
+    def test_executors_censor_with_the_current_words(self):
+        async def censor(custom_profanity, pool):
+            # Enough texts for both workers to censor some of them
+            return await asyncio.gather(
+                *[
+                    custom_profanity.acensor(
+                        "fuck frak", executor=pool, inline_max_length=0
+                    )
+                    for _ in range(8)
+                ]
+            )
+
+        for executor in ["thread", "process"]:
+            custom_profanity = Profanity(["fuck"])
+            with custom_profanity.create_executor(2, executor=executor) as pool:
+                for update, censored_text in [
+                    (None, "**** frak"),
+                    (custom_profanity.add_censor_words, "**** ****"),
+                    (custom_profanity.remove_censor_words, "**** frak"),
+                ]:
+                    if update is not None:
+                        update(["frak"])
+                    censored_texts = self.run_coroutine(censor(custom_profanity, pool))
+                    self.assertEqual(censored_texts, [censored_text] * 8)
+
+    def test_executor_of_another_filter(self):
+        with profanity.create_executor(workers=1, executor="thread") as pool:
+            with self.assertRaises(ValueError):
+                self.run_coroutine(
+                    Profanity(["frak"]).acensor(
+                        "frak", executor=pool, inline_max_length=0
+                    )
+                )
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            with self.assertRaises(ValueError):
+                self.run_coroutine(
+                    profanity.acensor(self.text, executor=pool, inline_max_length=0)
+                )
+
+    def test_batcher(self):
+        submitted_batches = []
+
+        class Executor(ThreadPoolExecutor):
+            def submit(self, task, texts):
+                submitted_batches.append(texts)
+                return super().submit(task, texts)
+
+        async def censor(batcher):
+            return await asyncio.gather(
+                *[batcher.censor(self.text, "-") for _ in range(5)],
+                batcher.contains_profanity("Hi there"),
+                batcher.censor("Hi there", "-"),
+            )
+
+        with Executor(max_workers=1) as pool:
+            results = self.run_coroutine(
+                censor(ProfanityBatcher(profanity, executor=pool))
+            )
+        self.assertEqual(
+            results,
+            [self.censored_text.replace("*", "-")] * 5 + [False, "Hi there"],
+        )
+        self.assertEqual(
+            sorted(submitted_batches), [["Hi there"], [self.text] * 5 + ["Hi there"]]
+        )
+
+
+class ProfanityStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        profanity.load_censor_words()
+
+    def iter_chunks(self, text, chunk_size):
+        return (text[i : i + chunk_size] for i in range(0, len(text), chunk_size))
+
+    def test_iter_censor(self):
+        texts = [
+            "That wh0re gave m3 a very good H4nd j0b, dude. You gotta check.",
+            "Those 2 girls 1 cup. You gotta check. ",
+            "fuck 2 girls 1 cup",
+            "...pen1s...hello_cat_vagina,,,,qew",
+            "",
+        ]
+        for text in texts:
+            for chunk_size in [1, 2, 3, 5, 8, 100]:
+                self.assertEqual(
+                    "".join(profanity.iter_censor(self.iter_chunks(text, chunk_size))),
+                    profanity.censor(text),
+                )
+
+    def test_iter_censor_of_long_words(self):
+        text = "x" * 100 + "fuck fuck " + "y" * 100
+        censored_chunks = list(profanity.iter_censor(self.iter_chunks(text, 10)))
+        self.assertEqual("".join(censored_chunks), "x" * 100 + "fuck **** " + "y" * 100)
+
+        # Long words are not held back
+        self.assertTrue(len(censored_chunks) > 10)
+
+    def test_censor_stream(self):
+        text = "Dude, I hate shit. Fuck bullshit. Those 2 girls 1 cup.\n" * 20
+        writer = io.StringIO()
+        profanity.censor_stream(io.StringIO(text), writer, "-", chunk_size=7)
+        self.assertEqual(writer.getvalue(), profanity.censor(text, "-"))
+
+
+class ProfanityCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.profanity = Profanity(["fuck", "shit"])
+        self.profanity.enable_cache(max_entries=2)
+
+    def test_cache_results(self):
+        self.assertNotIn("hits", Profanity(["fuck"]).cache_info())
+        for _ in range(3):
+            self.assertEqual(self.profanity.censor("fuck you"), "**** you")
+        self.assertTrue(self.profanity.contains_profanity("fuck you"))
+        self.assertEqual(self.profanity.censor("fuck you", "-"), "---- you")
+        info = self.profanity.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["entries"]), (2, 3, 2))
+        self.assertGreater(info["bytes"], 0)
+
+        # The least recently used result was evicted
+        self.profanity.censor("fuck you")
+        self.assertEqual(self.profanity.cache_info()["misses"], 4)
+
+    def test_cache_size_in_bytes(self):
+        self.profanity.enable_cache(max_bytes=1000)
+        self.profanity.censor("fuck " * 1000)
+        self.profanity.censor("fuck")
+        info = self.profanity.cache_info()
+        self.assertEqual(info["entries"], 1)
+        self.assertLessEqual(info["bytes"], 1000)
+
+    def test_token_verdicts(self):
+        custom_profanity = Profanity(["fuck", "shit", "not nice"])
+        self.assertEqual(custom_profanity.censor("oh fuck it"), "oh **** it")
+        self.assertEqual(
+            custom_profanity.censor("oh Fuck, it is n0t nice shit"),
+            "oh ****, it is **** ****",
+        )
+        info = custom_profanity.cache_info()
+        self.assertEqual((info["token_hits"], info["token_misses"]), (2, 7))
+        self.assertEqual(info["tokens"], 7)
+
+        # Tokens which start no swear word are never combined with the next ones
+        verdicts = custom_profanity._snapshot.token_verdicts
+        self.assertEqual(verdicts.lookup("oh"), (None, False))
+        self.assertEqual(verdicts.lookup("n0t"), (None, True))
+        self.assertEqual(verdicts.lookup("fuck"), ("fuck", False))
+
+        custom_profanity = Profanity(["fuck"], token_memo_size=0)
+        self.assertEqual(custom_profanity.censor("oh fuck, fuck"), "oh ****, ****")
+        info = custom_profanity.cache_info()
+        self.assertEqual((info["token_misses"], info["tokens"]), (3, 0))
+
+    def test_long_tokens_are_not_remembered(self):
+        custom_profanity = Profanity(["fuck", "2 girls 1 cup"])
+        long_word = "g" * 100000
+        text = "2 {long_word} 1 cup, {long_word} fuck".format(long_word=long_word)
+        censored_text = "2 {long_word} 1 cup, {long_word} ****".format(
+            long_word=long_word
+        )
+        for _ in range(2):
+            self.assertEqual(custom_profanity.censor(text), censored_text)
+
+        verdicts = custom_profanity._snapshot.token_verdicts
+        max_length = custom_profanity.CENSOR_WORDSET.max_length
+        self.assertNotIn(long_word, verdicts._verdicts)
+        self.assertTrue(
+            all(len(string) <= max_length for string in verdicts._joined_verdicts)
+        )
+
+    def test_max_tokens_is_deprecated(self):
+        custom_profanity = Profanity(["fuck"])
+        with self.assertWarns(DeprecationWarning):
+            custom_profanity.enable_cache(max_tokens=0)
+        self.assertEqual(custom_profanity.censor("oh fuck, fuck"), "oh ****, ****")
+        info = custom_profanity.cache_info()
+        self.assertEqual((info["max_tokens"], info["tokens"]), (0, 0))
+        self.assertEqual(info["misses"], 1)
+
+        # The memo keeps its size once the words change
+        custom_profanity.add_censor_words(["shit"])
+        self.assertEqual(custom_profanity.censor("oh shit"), "oh ****")
+        self.assertEqual(custom_profanity.cache_info()["tokens"], 0)
+
+    def test_reject_tokens_by_prefix(self):
+        custom_profanity = Profanity(["fuck", "2 girls 1 cup"])
+        text = "hello FVCK world, 2 g1rls 1 cup"
+        censored_text = "hello **** world, ****"
+        self.assertEqual(custom_profanity.censor(text), censored_text)
+        info = custom_profanity.cache_info()
+        self.assertEqual(info["token_rejections"], 2)
+        self.assertEqual(info["prefixes"], 8)
+
+        custom_profanity = Profanity(["fuck", "2 girls 1 cup"], prefix_length=0)
+        self.assertEqual(custom_profanity.censor(text), censored_text)
+        self.assertEqual(custom_profanity.cache_info()["token_rejections"], 0)
+
+    def test_invalidate_cache(self):
+        self.assertEqual(self.profanity.censor("heck you"), "heck you")
+        self.profanity.add_censor_words(["heck"])
+        self.assertEqual(self.profanity.censor("heck you"), "**** you")
+        self.profanity.load_censor_words(["you"])
+        self.assertEqual(self.profanity.censor("heck you"), "heck ****")
+        self.assertEqual(self.profanity.cache_info()["invalidations"], 2)
+
+        self.profanity.disable_cache()
+        self.assertNotIn("hits", self.profanity.cache_info())
+        self.assertEqual(self.profanity.censor("heck you"), "heck ****")
+
+
+class ProfanityStatsTest(unittest.TestCase):
+    def test_stats(self):
+        custom_profanity = Profanity(["fuck", "shit", "not nice"])
+        self.assertIsNone(custom_profanity.stats_info())
+
+        measurements = []
+        custom_profanity.enable_stats(measurements.append)
+        self.assertEqual(custom_profanity.censor("oh fuck it"), "oh **** it")
+        self.assertEqual(
+            custom_profanity.censor("oh Fuck, it is n0t nice shit"),
+            "oh ****, it is **** ****",
+        )
+        self.assertTrue(custom_profanity.contains_profanity("shit happens"))
+
+        info = custom_profanity.stats_info()
+        self.assertEqual(
+            (info["censor_calls"], info["contains_profanity_calls"]), (2, 1)
+        )
+        self.assertEqual((info["characters"], info["tokens"]), (50, 12))
+        self.assertEqual((info["lookups"], info["candidates"]), (10, 6))
+        self.assertEqual(info["matches"], 5)
+        self.assertGreater(info["match_seconds"], 0)
+
+        self.assertEqual(len(measurements), 3)
+        self.assertEqual(measurements[0]["operation"], "censor")
+        self.assertEqual(measurements[0]["candidates"], 1)
+        # The verdict of "shit" is remembered, and the scan stops at it
+        self.assertEqual(measurements[2]["operation"], "contains_profanity")
+        self.assertEqual(
+            (measurements[2]["candidates"], measurements[2]["matches"]), (0, 1)
+        )
+
+    def test_stats_of_bounded_lookahead(self):
+        custom_profanity = Profanity(["fuck", "the quick brown fox jumps"])
+        custom_profanity.enable_stats()
+        self.assertEqual(
+            custom_profanity.censor(
+                "the cat sat on the mat, the quick brown fox jumps"
+            ),
+            "the cat sat on the mat, ****",
+        )
+        # "the cat" and "the mat" start no swear word, so their next words are
+        # not looked up, even though a swear word spans up to 4 next words
+        self.assertEqual(custom_profanity.MAX_NUMBER_COMBINATIONS, 4)
+        self.assertEqual(custom_profanity.stats_info()["candidates"], 10)
+
+    def test_stats_of_trie(self):
+        custom_profanity = Profanity(["fuck", "not nice"], engine="trie")
+        custom_profanity.enable_stats()
+        self.assertEqual(
+            custom_profanity.censor("oh fuck it, n0t nice"), "oh **** it, ****"
+        )
+        info = custom_profanity.stats_info()
+        self.assertEqual((info["tokens"], info["lookups"], info["matches"]), (5, 4, 2))
+
+    def test_stats_are_kept(self):
+        custom_profanity = Profanity(["fuck"])
+        custom_profanity.enable_stats()
+        custom_profanity.censor("fuck")
+        custom_profanity.add_censor_words(["heck"])
+        custom_profanity.censor("heck")
+        self.assertEqual(custom_profanity.stats_info()["censor_calls"], 2)
+
+        # Overlays and copies sent to worker processes do not measure their scans
+        self.assertIsNone(custom_profanity.overlay(["shit"]).stats_info())
+        copied_profanity = pickle.loads(pickle.dumps(custom_profanity))
+        self.assertIsNone(copied_profanity.stats_info())
+        self.assertEqual(copied_profanity.censor("fuck"), "****")
+
+        custom_profanity.disable_stats()
+        custom_profanity.censor("fuck")
+        self.assertIsNone(custom_profanity.stats_info())
+
+
+class ProfanityThreadSafetyTest(unittest.TestCase):
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_censor_while_reloading(self):
+        # Long enough for the words to be reloaded while it is censored
+        text = "Fuck, this is n0t a nice w0rd, shit. " * 100
+        wordlists = {
+            "****, this is n0t a nice w0rd, shit. " * 100: ["fuck"],
+            "****, this is ****, ****. " * 100: ["fuck", "not a nice word", "shit"],
+        }
+        for engine in ["wordset", "trie"]:
+            custom_profanity = Profanity(["fuck"], engine=engine)
+            results = set()
+            done = threading.Event()
+
+            def censor():
+                while not done.is_set():
+                    results.add(custom_profanity.censor(text))
+
+            threads = [threading.Thread(target=censor) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            try:
+                for _ in range(20):
+                    for words in wordlists.values():
+                        custom_profanity.load_censor_words(words)
+                    custom_profanity.add_censor_words(["not a nice word", "shit"])
+                    custom_profanity.remove_censor_words(["not a nice word", "shit"])
+            finally:
+                done.set()
+                for thread in threads:
+                    thread.join()
+            self.assertLessEqual(results, set(wordlists))
+
+
+class ProfanityTrieEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.profanity = Profanity(engine="trie")
+
+    def test_censorship(self):
+        bad_text = "That wh0re gave m3 a very good H4nd j0b, dude. You gotta check."
+        censored_text = "That **** gave m3 a very good ****, dude. You gotta check."
+        self.assertEqual(self.profanity.censor(bad_text), censored_text)
+
+    def test_censorship_of_multiple_words(self):
+        self.assertEqual(self.profanity.censor("fuck 2 girls 1 cup"), "**** ****")
+        self.assertEqual(
+            self.profanity.censor("Those 2 gir1$ 1 cvp. You gotta check. "),
+            "Those ****. You gotta check. ",
+        )
+
+    def test_censorship_without_spaces(self):
+        bad_text = "...pen1s...hello_cat_vagina,,,,qew"
+        censored_text = "...****...hello_cat_****,,,,qew"
+        self.assertEqual(self.profanity.censor(bad_text), censored_text)
+
+    def test_custom_words(self):
+        self.profanity.add_censor_words(["supremacia ariana"])
+        self.assertEqual(self.profanity.censor("supremacia ariana"), "****")
+
+    def test_whitelist_words(self):
+        self.profanity.load_censor_words(whitelist_words=["boobs"])
+        self.assertEqual(self.profanity.censor("I have boobs"), "I have boobs")
+
+    def test_remove_censor_words(self):
+        trie = self.profanity.CENSOR_TRIE
+        self.profanity.add_censor_words(["frak"])
+        self.profanity.remove_censor_words(["boobs"])
+        self.assertEqual(self.profanity.censor("fr4k boobs"), "**** boobs")
+        # The previous trie is left as it was
+        self.assertEqual(trie.match([("boobs", 0, 5, "")], 0, 1), (0, "boobs"))
+        self.assertEqual(trie.match([("frak", 0, 4, "")], 0, 1), (-1, None))
+
+    def test_same_results_as_wordset_engine(self):
+        wordset_profanity = Profanity(engine="wordset")
+        data_dir = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "benchmarking/data/paragraphs"
+        )
+        for dataset in ["0001paras-100per", "0010paras-050per"]:
+            with open(os.path.join(data_dir, dataset, "original.txt")) as f:
+                text = f.read()
+            self.assertEqual(
+                self.profanity.censor(text), wordset_profanity.censor(text)
+            )
+
+        # Short texts of words of many words, ending with single characters
+        words = ["x", "ab", "a b", "x x", "b-a", "a1 x", "hello x x"]
+        characters = ["a", "b", "x", "1", "@", " ", "-", "."]
+        rng = random.Random(0)
+        for _ in range(1000):
+            censor_words = rng.sample(words, rng.randint(1, 4))
+            text = "".join(rng.choice(characters) for _ in range(rng.randint(0, 10)))
+            if rng.random() < 0.3:
+                text = rng.choice(censor_words) + rng.choice(["", " ", "x", " x"])
+            self.assertEqual(
+                Profanity(censor_words, engine="trie").censor(text),
+                Profanity(censor_words, engine="wordset").censor(text),
+                (censor_words, text),
+            )
+
+    def test_single_character_ending_the_text(self):
+        # A single character ending the text is never one of the next words
+        for words, text, censored_text in [
+            (["ab c", "ab"], "ab c", "**** c"),
+            (["ab c", "ab"], "ab c ", "**** "),
+            (["hello x x"], "hello x x", "hello x x"),
+        ]:
+            for engine in ["wordset", "trie"]:
+                self.assertEqual(
+                    Profanity(words, engine=engine).censor(text), censored_text
+                )
+
+    def test_iter_matches(self):
+        self.assertEqual(
+            list(self.profanity.iter_matches("Those 2 gir1$ 1 cvp, you sh1t")),
+            [
+                ProfanityMatch(6, 19, "2 girls 1 cup"),
+                ProfanityMatch(25, 29, "shit"),
+            ],
+        )
+        self.assertTrue(self.profanity.contains_profanity("you sh1t"))
+        self.assertFalse(self.profanity.contains_profanity("Hi there"))
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            Profanity(engine="regex")
+
+    def test_substitutions_of_different_lengths(self):
+        profanity = Profanity(engine="trie")
+        profanity.CHARS_MAPPING["s"] = ("s", "$$")
+        with self.assertRaises(ValueError):
+            profanity.load_censor_words()
+
+
+@unittest.skipIf(_speedups is None, "the scanner in C is not built")
+class ProfanitySpeedupsTest(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            "That wh0re gave m3 a very good H4nd j0b, dude. You gotta check.",
+            "Those 2 gir1$ 1 cvp, you SH1T... f.u.c.k",
+            "...pen1s...hello_cat_vagina,,,,qew",
+            "ΑΣ Σ ας, İ é 日本語 😀 shit",
+            "",
+            "a",
+            "Hi there a",
+        ]
+
+    @contextlib.contextmanager
+    def scanner(self, extension):
+        previous_extension = speedups.extension
+        speedups.extension = extension
+        try:
+            yield
+        finally:
+            speedups.extension = previous_extension
+
+    def scan(self, profanity, extension):
+        with self.scanner(extension):
+            return [
+                (
+                    profanity.censor(text),
+                    profanity.contains_profanity(text),
+                    list(profanity.iter_matches(text)),
+                    list(profanity.iter_censor([text[:7], text[7:]])),
+                )
+                for text in self.texts
+            ]
+
+    def test_same_results_as_pure_python(self):
+        data_dir = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "benchmarking/data/paragraphs"
+        )
+        with open(os.path.join(data_dir, "0010paras-050per", "original.txt")) as f:
+            self.texts.append(f.read())
+        for words in (None, ["ab cd", "ας σα", "shit", "s h i t", "x x"]):
+            profanity = Profanity(words)
+            self.assertEqual(
+                self.scan(profanity, _speedups), self.scan(profanity, None)
+            )
+
+    def test_same_counters_as_pure_python(self):
+        counters = []
+        for extension in (_speedups, None):
+            profanity = Profanity(["fuck", "shit", "not nice"])
+            self.scan(profanity, extension)
+            counters.append(profanity.cache_info())
+        self.assertEqual(counters[0], counters[1])
+
+    def test_tokenize(self):
+        allowed_characters = load_allowed_characters()
+        for text in self.texts:
+            with self.scanner(None):
+                tokens = allowed_characters.tokenize(text, 1, len(text) - 1)
+            with self.scanner(_speedups):
+                self.assertEqual(
+                    allowed_characters.tokenize(text, 1, len(text) - 1), tokens
+                )
+
+    def test_disabled_by_environment(self):
+        environment = dict(os.environ, BETTER_PROFANITY_NO_SPEEDUPS="1")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from better_profanity import speedups; print(speedups.extension)",
+            ],
+            env=environment,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertEqual(result.stdout.strip(), "None")
+
+
+class ProfanityCompiledWordlistTest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "wordlist.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load_compiled(self):
+        custom_profanity = Profanity(["happy", "jolly", "merry christmas"])
+        custom_profanity.compile().save(self.filename)
+
+        for engine in ["wordset", "trie"]:
+            compiled_profanity = Profanity.load_compiled(self.filename, engine=engine)
+            self.assertEqual(
+                compiled_profanity.censor("H4ppy you, m3rry chr1stmas! Fuck."),
+                "**** you, ****! Fuck.",
+            )
+            self.assertEqual(compiled_profanity.MAX_NUMBER_COMBINATIONS, 1)
+
+    def test_save_and_load_order_of_words(self):
+        # A variant of several words is reported as the first one of them
+        custom_profanity = Profanity(["shit", "sh1t", "fvck", "fuck"])
+        custom_profanity.compile().save(self.filename)
+
+        compiled_profanity = Profanity.load_compiled(self.filename)
+        self.assertEqual(
+            [match.word for match in compiled_profanity.iter_matches("sh1t fuck")],
+            ["shit", "fvck"],
+        )
+        self.assertEqual(
+            list(compiled_profanity.CENSOR_WORDSET),
+            list(custom_profanity.CENSOR_WORDSET),
+        )
+
+    def test_save_and_load_custom_chars_mapping(self):
+        custom_profanity = Profanity(["ass"])
+        custom_profanity.CHARS_MAPPING["s"] = ("s", "$$", "z")
+        custom_profanity.load_censor_words(["ass", "fuck"])
+        custom_profanity.compile().save(self.filename)
+
+        compiled_profanity = Profanity.load_compiled(self.filename)
+        self.assertEqual(compiled_profanity.CHARS_MAPPING["s"], ("s", "$$", "z"))
+        self.assertEqual(compiled_profanity.censor("a$$$$ azz fvck"), "**** **** ****")
+
+    def test_save_and_load_allowed_characters(self):
+        custom_profanity = Profanity(["shit"], allowed_characters="shitSHIT_")
+        custom_profanity.compile().save(self.filename)
+
+        compiled_profanity = Profanity.load_compiled(self.filename)
+        self.assertEqual(
+            compiled_profanity.ALLOWED_CHARACTERS, custom_profanity.ALLOWED_CHARACTERS
+        )
+        self.assertEqual(compiled_profanity.censor("SHIT, shit_s"), "****, shit_s")
+
+    def test_load_invalid_compiled_wordlist(self):
+        with open(self.filename, "w") as f:
+            f.write("fuck\nshit\n")
+        with self.assertRaises(ValueError):
+            Profanity.load_compiled(self.filename)
+        with self.assertRaises(FileNotFoundError):
+            Profanity.load_compiled("not_found_file.bin")
+
+    def test_default_compiled_wordlist_is_up_to_date(self):
+        compiled_wordlist = CompiledWordlist.load(
+            get_complete_path_of_file(DEFAULT_COMPILED_WORDLIST_FILENAME)
+        )
+        self.assertEqual(
+            compiled_wordlist.checksum,
+            get_wordlist_checksum(get_complete_path_of_file("profanity_wordlist.txt")),
+        )
+
+        # The default filter takes its characters and substitutions from it
+        custom_profanity = Profanity(["fuck"])
+        self.assertEqual(compiled_wordlist.char_map, custom_profanity.CHARS_MAPPING)
+        self.assertEqual(
+            compiled_wordlist.allowed_characters, load_allowed_characters()
+        )
+        self.assertEqual(
+            compiled_wordlist.allowed_characters, Profanity().ALLOWED_CHARACTERS
+        )
+
+
+class ProfanityBulkTest(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            "Hello there",
+            "You sh1t, 2 g1rls 1 cup",
+            None,
+            "",
+            "fuck fuck",
+            float("nan"),
+            "Đây là một câu bậy",
+        ]
+
+    def check_result(self, result):
+        self.assertEqual(
+            list(result.flags), [False, True, False, False, True, False, False]
+        )
+        self.assertEqual(list(result.counts), [0, 2, 0, 0, 2, 0, 0])
+        self.assertEqual(
+            list(result.censored),
+            [
+                "Hello there",
+                "You ****, ****",
+                None,
+                "",
+                "**** ****",
+                None,
+                "Đây là một câu bậy",
+            ],
+        )
+
+    def test_score_list(self):
+        result = bulk.score(self.texts, censor=True)
+        self.check_result(result)
+        self.assertIsNone(bulk.score(self.texts).censored)
+
+        # Texts are scanned alike, whether they are screened or not
+        texts = ["word " * 30 + "sh1t", "b1tch " + "word " * 30] * 3
+        self.assertEqual(
+            bulk.score(texts, censor=True, chunk_size=4).censored,
+            [profanity.censor(text) for text in texts],
+        )
+
+    def test_score_custom_profanity(self):
+        custom_profanity = Profanity(["happy"], engine="trie")
+        result = bulk.score(
+            iter(["happy day", "sh1t"]), custom_profanity, censor=True, censor_char="-"
+        )
+        self.assertEqual(result, ([True, False], [1, 0], ["---- day", "sh1t"]))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_score_numpy(self):
+        result = bulk.score(numpy.array(self.texts, dtype=object), censor=True)
+        self.assertEqual(result.flags.dtype, bool)
+        self.assertEqual(result.censored.dtype, object)
+        self.check_result(result)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_score_pyarrow(self):
+        texts = [text if isinstance(text, str) else None for text in self.texts]
+        for array in [
+            pyarrow.array(texts),
+            pyarrow.array(texts, type=pyarrow.large_string()),
+            pyarrow.array(["", "x"] + texts).slice(2),
+            pyarrow.chunked_array([texts[:3], texts[3:]]),
+        ]:
+            result = bulk.score(array, censor=True, chunk_size=3)
+            self.assertEqual(result.flags.type, pyarrow.bool_())
+            self.assertEqual(result.censored.type, array.type)
+            self.check_result(
+                bulk.BulkResult(*[values.to_pylist() for values in result])
+            )
+
+
+class ProfanityCommandLineTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = self.path("output.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.directory.name, filename)
+
+    def write(self, filename, data):
+        with open(self.path(filename), "wb") as output_file:
+            output_file.write(data)
+        return self.path(filename)
+
+    def run_main(self, *args):
+        self.assertEqual(cli.main(list(args) + ["-o", self.output, "-q"]), 0)
+        with open(self.output, "rb") as output_file:
+            return output_file.read()
+
+    def test_censor_lines(self):
+        first = self.write("first.txt", b"Hello\nYou sh1t\r\n\xff fuck")
+        second = self.write("second.txt", b"happy fuck\n")
+        whitelist = self.write("whitelist.txt", b"fuck\n")
+        wordlist = self.write("wordlist.txt", b"happy\nfuck\n")
+        self.assertEqual(
+            self.run_main(first, second),
+            b"Hello\nYou ****\r\n\xff ****happy ****\n",
+        )
+        self.assertEqual(
+            self.run_main(first, "--whitelist", whitelist, "--censor-char", "-"),
+            b"Hello\nYou ----\r\n\xff fuck",
+        )
+        self.assertEqual(
+            self.run_main(second, "--wordlist", wordlist, "--flag", "-j", "2"),
+            b"true\n",
+        )
+
+    def test_jsonl(self):
+        records = self.write(
+            "records.jsonl",
+            b'{"text": "sh1t", "name": "fuck", "n": 1}\n\n{"text": 1}\n[1]\n',
+        )
+        self.assertEqual(
+            self.run_main(records, "--jsonl", "--field", "name"),
+            b'{"text": "sh1t", "name": "****", "n": 1}\n\n{"text": 1}\n[1]\n',
+        )
+        self.assertEqual(
+            self.run_main(records, "--jsonl", "--flag", "--chunksize", "1", "-j", "2"),
+            b'{"text": "sh1t", "name": "fuck", "n": 1, "contains_profanity": true}\n'
+            b'\n{"text": 1, "contains_profanity": false}\n[1]\n',
+        )
+
+        invalid = self.write("invalid.jsonl", b"{\n")
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(cli.main([invalid, "--jsonl", "-o", self.output]), 1)
+        self.assertIn("Invalid JSON line", stderr.getvalue())
+
+    def test_stdin_and_stats(self):
+        process = subprocess.run(
+            [sys.executable, "-m", "better_profanity"],
+            input=b"Hi there\nYou sh1t\n",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+        self.assertEqual(process.stdout, b"Hi there\nYou ****\n")
+        self.assertIn(b"2 lines", process.stderr)
+        self.assertIn(b"lines/s", process.stderr)
+
+
+class ProfanityRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.base = Profanity(["fuck", "shit", "2 girls 1 cup"])
+
+    def test_overlay(self):
+        for engine in ["wordset", "trie"]:
+            base = Profanity(["fuck", "shit", "2 girls 1 cup"], engine=engine)
+            overlay = base.overlay(["frak"], whitelist_words=["shit"])
+            text = "frak this shit, fuck, 2 g1rls 1 cup"
+            self.assertEqual(overlay.censor(text), "**** this shit, ****, ****")
+            self.assertEqual(base.censor(text), "frak this ****, ****, ****")
+
+            # The words of the base are looked up, not copied
+            self.assertEqual(len(overlay.CENSOR_WORDSET), 3)
+            self.assertEqual(
+                sorted(overlay.CENSOR_WORDSET), ["2 girls 1 cup", "frak", "fuck"]
+            )
+            self.assertEqual(overlay.cache_info()["prefixes"], 4)
+
+            overlay.remove_censor_words(["fuck"])
+            overlay.add_censor_words(["shit", "sh1t"])
+            self.assertEqual(overlay.censor("fuck shit sh1t"), "fuck shit ****")
+            self.assertEqual(base.censor("fuck shit sh1t"), "**** **** ****")
+
+    def test_compile_overlay(self):
+        overlay = self.base.overlay(["frak"], whitelist_words=["shit"])
+        compiled = Profanity(overlay.compile())
+        self.assertEqual(
+            sorted(compiled.CENSOR_WORDSET), ["2 girls 1 cup", "frak", "fuck"]
+        )
+
+    def test_registry(self):
+        registry = ProfanityRegistry(self.base, max_tenants=2)
+        registry.register("cats", ["dog"])
+        registry.register("dogs", ["cat"], whitelist_words=["fuck"])
+        registry.register("birds")
+        text = "cat dog fuck shit"
+        self.assertEqual(registry.censor("cats", text), "cat **** **** ****")
+        self.assertEqual(registry.censor("dogs", text), "**** dog fuck ****")
+        self.assertEqual(registry.censor("birds", text), "cat dog **** ****")
+        self.assertTrue(registry.contains_profanity("birds", text))
+        self.assertEqual(registry.info()["evictions"], 1)
+
+        # Evicted tenants get their filter again
+        self.assertEqual(registry.censor("cats", text), "cat **** **** ****")
+        self.assertIs(registry.get("cats"), registry.get("cats"))
+
+        registry.register("cats", ["cat"])
+        self.assertEqual(registry.censor("cats", text), "**** dog **** ****")
+        registry.unregister("cats")
+        self.assertFalse("cats" in registry)
+        with self.assertRaises(KeyError):
+            registry.get("cats")
+        with self.assertRaises(TypeError):
+            registry.register("cats", "cat")
+
+    def test_registry_follows_base(self):
+        registry = ProfanityRegistry(self.base)
+        registry.register("cats", ["dog"], whitelist_words=["shit"])
+        text = "heck dog fuck shit"
+        self.assertEqual(registry.censor("cats", text), "heck **** **** shit")
+
+        # Tenants cached before the base changes censor its new words
+        self.base.add_censor_words(["heck"])
+        self.assertEqual(registry.censor("cats", text), "**** **** **** shit")
+        self.base.load_censor_words(["shit", "dog"])
+        self.assertEqual(registry.censor("cats", text), "heck **** fuck shit")
+        self.assertIs(registry.get("cats"), registry.get("cats"))
+
+
 class ProfanityLargeCorpusTest(unittest.TestCase):
     def setUp(self):
         self.maxDiff = None